@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic data directory ('.package_data' layout) for benchmarks.
+
+Every project gets every list from config.json, filled with 'entries' rows. Descriptions are random words up to
+'description_length' characters, archived entries are spread over the past year, and each project's scheduled list
+holds 'scheduled' entries of which 'overdue' are already past due (a backlog for check_scheduled).
+
+Usage:
+$ python benchmarks/generate.py /tmp/bench_data
+$ python benchmarks/generate.py /tmp/bench_data -projects 20 -entries 5000 -description_length 200 -scheduled 50
+"""
+
+# base imports
+import argparse
+import csv
+import json
+import os
+import random
+import string
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from task_terminal.helpers.helpers import CONFIG, columns, date_format  # noqa: E402
+
+words = ["review", "draft", "report", "call", "email", "fix", "plan", "budget", "meeting", "notes", "data", "model"]
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    text = ""
+    while len(text) < length:
+        text += rng.choice(words) + " "
+    return text[:length].strip()
+
+
+def make_ids(rng: random.Random, n: int) -> list:
+    """Unique IDs in the format of helpers/ids.py (a letter, then four letters or digits)."""
+    ids = set()
+    while len(ids) < n:
+        ids.add(rng.choice(string.ascii_lowercase) + "".join(rng.choices(string.ascii_lowercase + string.digits, k=4)))
+    return list(ids)
+
+
+def make_row(rng: random.Random, entry_id: str, now: datetime, description_length: int) -> dict:
+    created = now - timedelta(days=rng.uniform(0, 365))
+    return {
+        "entry": random_text(rng, rng.randint(10, 40)),
+        "description": random_text(rng, rng.randint(0, description_length)) if description_length else "",
+        "time_estimate": rng.choice(["", 0.5, 1.0, 2.0, 4.0]),
+        "flagged": rng.random() < 0.1,
+        "datetime_created": created.strftime(date_format),
+        "datetime_moved": "",
+        "datetime_scheduled": "",
+        "id": entry_id,
+    }
+
+
+def generate(
+    path: str,
+    projects: int = 5,
+    entries: int = 1000,
+    description_length: int = 80,
+    scheduled: int = 20,
+    overdue: int = 10,
+    seed: int = 0,
+) -> list:
+    """Write the data directory at 'path' (which must not exist). Returns the project names."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    names = [f"proj{i}" for i in range(projects)]
+    os.makedirs(f"{path}/projects")
+    json.dump(names, open(f"{path}/project_list.json", "w"))
+    json.dump([], open(f"{path}/hidden_project_list.json", "w"))
+
+    ids = iter(make_ids(rng, projects * (len(CONFIG) * entries + scheduled)))
+    for project in names:
+        os.makedirs(f"{path}/projects/{project}")
+        for file in CONFIG.keys():
+            n = scheduled if file == "scheduled" else entries
+            rows = [make_row(rng, next(ids), now, description_length) for _ in range(n)]
+            if file == "scheduled":
+                for i, row in enumerate(rows):
+                    offset = -rng.uniform(1, 48) if i < overdue else rng.uniform(1, 24 * 30)
+                    row["datetime_scheduled"] = (now + timedelta(hours=offset)).strftime(date_format)
+            elif file == "archives":
+                # oldest first, as entries are appended when archived
+                moved = sorted(now - timedelta(days=rng.uniform(0, 365)) for _ in rows)
+                for row, when in zip(rows, moved):
+                    row["datetime_moved"] = when.strftime(date_format)
+            with open(f"{path}/projects/{project}/{file}.csv", "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=columns)
+                writer.writeheader()
+                writer.writerows(rows)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic data directory for benchmarks.")
+    parser.add_argument("path", type=str, help="Directory to create.")
+    parser.add_argument("-projects", type=int, default=5, help="Number of projects.")
+    parser.add_argument("-entries", type=int, default=1000, help="Entries per list.")
+    parser.add_argument("-description_length", type=int, default=80, help="Maximum description length.")
+    parser.add_argument("-scheduled", type=int, default=20, help="Entries in each project's scheduled list.")
+    parser.add_argument("-overdue", type=int, default=10, help="How many of the scheduled entries are past due.")
+    parser.add_argument("-seed", type=int, default=0, help="Random seed.")
+    d = vars(parser.parse_args())
+
+    generate(**d)
+    print(f"Wrote {d['projects']} projects with {d['entries']} entries per list to {d['path']}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Time the main commands end to end against generated data directories of increasing size, and compare the results
+with a stored baseline.
+
+For each size, a data directory is generated (see generate.py) and warmed with one 'lst' per list so indexes and
+manifests exist. Every run then works on a fresh copy, in a fresh interpreter, without the daemon. Mutating
+commands run with -json (no prompts and no follow-up list redraw). Copying gives every list a new inode, so caches
+keyed by list version (rendered lists, sidecars) start cold in each run. 'check_scheduled' is an 'lst' on an
+unwarmed copy whose projects each have a backlog of overdue scheduled entries.
+
+Usage:
+$ python benchmarks/operations.py
+$ python benchmarks/operations.py -sizes 100 1000 10000 -runs 5 -output results.json
+$ python benchmarks/operations.py -save
+"""
+
+# base imports
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from generate import generate
+
+src_path = Path(__file__).resolve().parents[1] / "src"
+baseline_path = Path(__file__).resolve().parent / "baseline.json"
+operations = {
+    "lst": ["lst", "proj0", "tasks"],
+    "lst all": ["lst", "all", "tasks"],
+    "lst archives tail": ["lst", "proj0", "archives", "-tail", "20"],
+    "addto": ["addto", "proj0", "tasks", "-entry", "benchmark entry", "-json"],
+    "pull": ["pull", "proj0", "tasks", "0", "3", "5", "7", "-json"],
+    "move": ["move", "proj0", "tasks", "0", "5", "-json"],
+    "rmfrom": ["rmfrom", "proj0", "tasks", "0", "1", "2", "-yes", "-json"],
+    # -json: interactively, releasing entries also pauses 1.5 s to show the notice
+    "check_scheduled": ["lst", "proj0", "tasks", "-json"],
+}
+
+
+def environment(data_path: str) -> dict:
+    return dict(
+        os.environ, TASK_TERMINAL_DATA=data_path, TASK_TERMINAL_NO_DAEMON="1", PYTHONPATH=str(src_path), TERM="xterm"
+    )
+
+
+def run_command(args: list, data_path: str) -> subprocess.CompletedProcess:
+    command = [sys.executable, "-m", f"task_terminal.{args[0]}"] + args[1:]
+    return subprocess.run(
+        command, env=environment(data_path), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+
+
+def make_template(path: str, projects: int, entries: int, backlog: int) -> None:
+    names = generate(path, projects=projects, entries=entries, scheduled=max(backlog, 20), overdue=backlog)
+    if backlog:
+        # warming would release the backlog, so only mark every project as due in the next-due index
+        json.dump({p: {"scheduled": "2000-01-01T00:00:00"} for p in names}, open(f"{path}/schedule_index.json", "w"))
+        return
+    for file in ["tasks", "archives", "scheduled", "backburner"]:
+        run_command(["lst", "all", file], path)
+
+
+def time_operation(args: list, template: str, runs: int) -> dict:
+    """Median wall time over 'runs', each on a fresh copy of 'template'. Failures are recorded, not raised."""
+    times = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(runs):
+            data_path = f"{tmp}/run{i}"
+            shutil.copytree(template, data_path)
+            start = time.perf_counter()
+            result = run_command(args, data_path)
+            elapsed = (time.perf_counter() - start) * 1000
+            if result.returncode:
+                lines = result.stderr.decode().strip().splitlines()
+                return {"median_ms": None, "error": lines[-1].strip() if lines else f"exit {result.returncode}"}
+            times.append(elapsed)
+    return {"median_ms": round(statistics.median(times), 1), "error": None}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print each result next to the baseline and return the operations slower than 'threshold' times it."""
+    regressions = []
+    for size, ops in results.items():
+        print(f"\n{size} entries per list")
+        for op, result in ops.items():
+            before = baseline.get(size, {}).get(op, {}).get("median_ms")
+            now = result["median_ms"]
+            if now is None:
+                print(f"    {op:<20}{'failed':>10}    {result['error']}")
+                continue
+            if before is None:
+                print(f"    {op:<20}{now:>10.1f} ms")
+                continue
+            ratio = now / before
+            print(f"    {op:<20}{now:>10.1f} ms{before:>10.1f} ms (baseline){ratio:>8.2f}x")
+            if ratio > threshold:
+                regressions.append(f"{op} at {size} entries: {now:.1f} ms vs {before:.1f} ms baseline")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the main commands against generated data.")
+    parser.add_argument("-sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Entries per list.")
+    parser.add_argument("-projects", type=int, default=5, help="Number of projects.")
+    parser.add_argument("-backlog", type=int, default=50, help="Overdue scheduled entries per project.")
+    parser.add_argument("-runs", type=int, default=3, help="Runs per operation; the median is reported.")
+    parser.add_argument("-operations", type=str, nargs="+", choices=list(operations), default=list(operations))
+    parser.add_argument("-baseline", type=str, default=str(baseline_path), help="Baseline results to compare with.")
+    parser.add_argument("-threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression.")
+    parser.add_argument("-output", type=str, help="Also write the results to this file.")
+    parser.add_argument(
+        "-save",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, store the results as the new baseline instead of comparing.",
+    )
+    d = vars(parser.parse_args())
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in d["sizes"]:
+            template = f"{tmp}/{size}"
+            make_template(template, d["projects"], size, backlog=0)
+            make_template(f"{template}-backlog", d["projects"], size, backlog=d["backlog"])
+            results[str(size)] = {}
+            for op in d["operations"]:
+                source = f"{template}-backlog" if op == "check_scheduled" else template
+                results[str(size)][op] = time_operation(operations[op], source, d["runs"])
+                print(f"{size:>8} {op:<20}{results[str(size)][op]['median_ms'] or 'failed':>10}", flush=True)
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "projects": d["projects"],
+            "backlog": d["backlog"],
+            "runs": d["runs"],
+        },
+        "results": results,
+    }
+    if d["output"]:
+        json.dump(report, open(d["output"], "w"), indent=2)
+    if d["save"]:
+        json.dump(report, open(d["baseline"], "w"), indent=2)
+        print(f"\nBaseline written to {d['baseline']}.")
+        return
+
+    baseline = json.load(open(d["baseline"], "r"))["results"] if os.path.isfile(d["baseline"]) else {}
+    regressions = compare(results, baseline, d["threshold"])
+    if regressions:
+        print("\n" + "\n".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Time console script startup and check which commands import pandas.
+
+Each command is run as a fresh interpreter against a throwaway data directory. 'lsproj', 'moveproj', 'hideproj' and
+a 'taskcomplete' completion request must never import pandas; every probe must finish within the time budget.
+
+Usage:
+$ python benchmarks/startup.py
+$ python benchmarks/startup.py -runs 20 -budget 50
+"""
+
+# base imports
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+src_path = Path(__file__).resolve().parents[1] / "src"
+commands = [
+    "lst",
+    "addto",
+    "addproj",
+    "edit",
+    "hideproj",
+    "lsproj",
+    "move",
+    "moveproj",
+    "pull",
+    "rmfrom",
+    "rmproj",
+    "taskcomplete",
+]
+pandas_free = ["lsproj", "moveproj", "hideproj", "taskcomplete"]
+
+
+def make_data_dir(path):
+    os.makedirs(f"{path}/projects")
+    json.dump([], open(f"{path}/project_list.json", "w"))
+    json.dump([], open(f"{path}/hidden_project_list.json", "w"))
+
+
+def command_args(command):
+    if command == "taskcomplete":
+        return ["--", "pull", ""]
+    return [] if command == "lsproj" else ["--help"]
+
+
+def time_command(command, env, runs):
+    args = [sys.executable, "-m", f"task_terminal.{command}"] + command_args(command)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def imports_pandas(command, env):
+    args = [sys.executable, "-X", "importtime", "-m", f"task_terminal.{command}"] + command_args(command)
+    result = subprocess.run(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    return any(line.rstrip().endswith(" pandas") for line in result.stderr.splitlines())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time console script startup.")
+    parser.add_argument("-runs", type=int, default=10, help="Runs per command; the median is reported.")
+    parser.add_argument("-budget", type=float, default=50.0, help="Maximum median startup time in milliseconds.")
+    d = vars(parser.parse_args())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_data_dir(tmp)
+        env = dict(os.environ, TASK_TERMINAL_DATA=tmp, PYTHONPATH=str(src_path))
+
+        baseline = time_command_raw(env, d["runs"])
+        print(f"{'interpreter':<12}{baseline:>8.1f} ms")
+        failures = []
+        for command in commands:
+            ms = time_command(command, env, d["runs"])
+            pandas = imports_pandas(command, env)
+            print(f"{command:<12}{ms:>8.1f} ms{'    (imports pandas)' if pandas else ''}")
+            if ms > d["budget"]:
+                failures.append(f"{command} took {ms:.1f} ms (budget {d['budget']:.0f} ms)")
+            if pandas and command in pandas_free:
+                failures.append(f"{command} imported pandas")
+
+    if failures:
+        print("\n" + "\n".join(failures))
+        sys.exit(1)
+
+
+def time_command_raw(env, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,22 +8,22 @@ $ addproj PROJECT
 
 # base imports
 import argparse
-import json
 import os
 
-import pandas as pd
-
 from task_terminal import lst
 
-from .helpers.helpers import CONFIG, check_init, columns, data_path, reformat, timed_sleep
+from .helpers.daemon import forward
+from .helpers.helpers import check_init, data_path, emit, machine_mode, reformat, timed_sleep
+from .helpers.locks import registry_lock
+from .helpers.state import session
+from .helpers.store import get_store
 
 
 def main():
+    if forward("addproj"):
+        return
     check_init()
 
-    # establish parameters
-    project_list = json.load(open(f"{data_path}/project_list.json", "r"))
-
     # establish parser to pull in projects to view
     parser = argparse.ArgumentParser(description="Add project.")
     parser.add_argument(
@@ -32,6 +32,12 @@ def main():
         nargs="?",
         help="Project to create.",
     )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, run non-interactively and print the result as JSON.",
+    )
     d = vars(parser.parse_args())
 
     if not d["project"]:
@@ -39,15 +45,15 @@ def main():
     if os.path.exists(f"{data_path}/projects/{d['project']}"):
         raise ValueError(reformat(f"Project '{d['project']}' already exists.", input_type="error"))
 
-    base_path = f"{data_path}/projects/{d['project']}"
-
-    os.makedirs(base_path)
-    for file in CONFIG.keys():
-        pd.DataFrame(columns=columns).to_csv(f"{base_path}/{file}.csv", index=False)
-
-    project_list.append(d["project"])
-    json.dump(project_list, open(f"{data_path}/project_list.json", "w"))
+    with registry_lock():
+        get_store().create_project(d["project"])
+        project_list = session.registry(fresh=True)["active"]
+        project_list.append(d["project"])
+        session.save_registry(active=project_list)
 
+    if machine_mode():
+        emit({"command": "addproj", "project": d["project"]})
+        return
     print(reformat(f"Project '{d['project']}' created successfully."))
 
     timed_sleep()
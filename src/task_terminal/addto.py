@@ -5,40 +5,47 @@ Add item to list.
 Usage:
 $ addto PROJECT LIST
 $ addto PROJECT LIST IDX
+$ addto PROJECT LIST -entry TEXT -hours H -when WHEN -json
 """
 
 # base imports
 import argparse
-import json
 from contextlib import suppress
 from datetime import datetime
 
-import pandas as pd
-
 from task_terminal import lst
 
+from .helpers.daemon import forward
 from .helpers.helpers import (
     CONFIG,
+    ask,
     check_init,
     columns,
-    data_path,
-    define_idx,
+    define_store_idx,
+    emit,
     file_options,
-    move,
-    pkg_path,
+    machine_mode,
+    note_scheduled,
     process_file,
     reformat,
     reformat_date,
     timed_sleep,
+    valid_pos,
 )
+from .helpers.ids import new_id
+from .helpers.locks import project_lock
+from .helpers.state import session
+from .helpers.store import get_store
 
 
 def main():
+    if forward("addto"):
+        return
     check_init()
 
     # establish parameters
-    templates = json.load(open(f"{pkg_path}/helpers/templates.json"))
-    project_list = json.load(open(f"{data_path}/project_list.json", "r"))
+    templates = session.templates
+    project_list = session.projects
 
     # establish parser to pull in projects to view
     parser = argparse.ArgumentParser(description="Add item to list.")
@@ -61,7 +68,7 @@ def main():
         "pos",
         nargs="?",
         default="TAIL",
-        help="Position at which to add entry. Accepted arguments are zero / positive integer indices, 'HEAD', and 'TAIL'.",
+        help="Position at which to add entry. Accepted arguments are zero / positive integer indices, 'HEAD', 'TAIL', and entry IDs.",
     )
     parser.add_argument(
         "-flag",
@@ -81,12 +88,38 @@ def main():
         default=False,
         help="If provided, explicitly schedule movement.",
     )
+    parser.add_argument(
+        "-entry",
+        type=str,
+        help="Entry text. Prompted for if not provided.",
+    )
+    parser.add_argument(
+        "-description",
+        type=str,
+        help="Entry description. Implies -desc.",
+    )
+    parser.add_argument(
+        "-hours",
+        type=float,
+        help="Time estimate in hours, for lists that record one.",
+    )
+    parser.add_argument(
+        "-when",
+        type=str,
+        help="Release time (%%-m/%%-d %%H:%%M), for scheduled entries.",
+    )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, run non-interactively (all values from flags) and print the result as JSON.",
+    )
     d = vars(parser.parse_args())
 
-    if d["pos"] not in [None, "HEAD", "TAIL"] + [str(i) for i in range(100)]:
+    if not valid_pos(d["pos"]):
         raise ValueError(
             reformat(
-                "'pos' must be one of 'HEAD', 'TAIL', 0, or a positive integer less than 100.",
+                "'pos' must be one of 'HEAD', 'TAIL', 0, a positive integer, or an entry ID.",
                 input_type="error",
             )
         )
@@ -111,51 +144,47 @@ def main():
 
     entry_dict = {k: None for k in columns}
 
-    path = f"{data_path}/projects/{d['ref_proj']}/{file}.csv"
-    df = pd.read_csv(path)
-    entry_dict["entry"] = ""
-    entry_dict["description"] = ""
+    store = get_store()
+    entry_dict["entry"] = d["entry"] or ""
+    entry_dict["description"] = d["description"] or ""
     while entry_dict["entry"] == "":
-        entry_dict["entry"] = input(reformat("Provide entry:", input_type="input"))
-    if d["desc"]:
-        entry_dict["description"] = input(reformat("Describe entry:", input_type="input"))
+        entry_dict["entry"] = ask("Provide entry:", "-entry")
+    if d["desc"] and d["description"] is None:
+        entry_dict["description"] = ask("Describe entry:", "-description")
     entry_dict["datetime_created"] = str(datetime.now().strftime("%m/%d/%Y %H:%M:%S"))
     entry_dict["flagged"] = d["flag"]
+    entry_dict["id"] = new_id()
 
     if "attrs" in CONFIG[file].keys() and "hours" in CONFIG[file]["attrs"]:
-        entry_dict["time_estimate"] = ""
+        entry_dict["time_estimate"] = d["hours"] if d["hours"] is not None else ""
         while type(entry_dict["time_estimate"]) is not float:
+            # outside suppress: in machine mode ask raises ValueError, which must not be retried
+            answer = ask("How long will this take (in hours)?", "-hours")
+            with suppress(ValueError):
+                entry_dict["time_estimate"] = float(answer)
+
+    if ("attrs" in CONFIG[file].keys() and "schedule" in CONFIG[file]["attrs"]) or d["schedule"]:
+        if "pull_to" not in CONFIG[file].keys():
+            raise ValueError(reformat("Cannot schedule an entry to a file with no 'pull_to' parameter."))
+        scheduled = reformat_date(d["when"]) if d["when"] else ""
+        if d["when"] and not scheduled > datetime.now():
+            raise ValueError(reformat(f"'-when' {scheduled} is not in the future.", input_type="error"))
+        while type(scheduled) is not datetime or not scheduled > datetime.now():
+            answer = ask("When should this be released? (%-m/%-d %H:%M)", "-when")
             with suppress(ValueError):
-                entry_dict["time_estimate"] = float(
-                    input(
-                        reformat(
-                            "How long will this take (in hours)?",
-                            input_type="input",
-                        )
-                    )
-                )
-        if ("attrs" in CONFIG[file].keys() and "schedule" in CONFIG[file]["attrs"]) or d["schedule"]:
-            if "pull_to" not in CONFIG[file].keys():
-                raise ValueError(reformat("Cannot schedule an entry to a file with no 'pull_to' parameter."))
-            scheduled = ""
-            while type(scheduled) is not datetime or not scheduled > datetime.now():
-                with suppress(ValueError):
-                    scheduled = input(
-                        reformat(
-                            "When should this be released? (%-m/%-d %H:%M)",
-                            input_type="input",
-                        )
-                    )
-                    scheduled = reformat_date(scheduled)
-            entry_dict["datetime_scheduled"] = scheduled.strftime("%m/%d/%Y %H:%M:%S")
-
-    df = df.append(entry_dict, ignore_index=True)
-    df = move(df, from_index=-1, to_index=define_idx(d["pos"], df))
-    df.to_csv(path, index=False)
-    df = pd.read_csv(path)
+                scheduled = reformat_date(answer)
+        entry_dict["datetime_scheduled"] = scheduled.strftime("%m/%d/%Y %H:%M:%S")
+
+    with project_lock(d["ref_proj"]):
+        pos = define_store_idx(d["pos"], store, d["ref_proj"], file, extra=1)
+        store.insert(d["ref_proj"], file, entry_dict, pos=pos)
+        note_scheduled(d["ref_proj"], file, entry_dict["datetime_scheduled"])
+    if machine_mode():
+        emit({"command": "addto", "project": d["ref_proj"], "file": file, "pos": pos, "entry": entry_dict})
+        return
     print(
         reformat(
-            f"Entry added successfully to {d['ref_proj']}.",
+            f"Entry {entry_dict['id']} added successfully to {d['ref_proj']}.",
             input_type=None,
         )
     )
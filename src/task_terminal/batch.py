@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Run many operations in one process: lists are loaded once, changed in memory, and each touched list is written once
+at the end (in one transaction where the store supports it). If any line fails, nothing is written.
+
+One operation per line; blank lines and lines starting with '#' are skipped. Prompted values are given as flags:
+
+    addto PROJECT LIST [POS] -entry TEXT [-desc TEXT] [-hours H] [-schedule WHEN] [-flag]
+    pull PROJECT LIST POS [POS ...] [-U]
+    move PROJECT LIST FROM TO [-schedule WHEN]
+    rmfrom PROJECT LIST POS [POS ...]
+    edit PROJECT LIST POS FIELD VALUE [-a]
+    hideproj PROJECT [-U]
+
+'-schedule' is required when adding or moving an entry to the scheduled list.
+
+$ batch FILE
+$ batch < FILE
+$ batch FILE -json
+"""
+
+# base imports
+import argparse
+import shlex
+import sys
+from contextlib import ExitStack
+from datetime import datetime
+
+from task_terminal import lst
+
+from .helpers.helpers import (
+    CONFIG,
+    check_init,
+    columns,
+    date_format,
+    define_idx,
+    define_store_idx,
+    emit,
+    file_options,
+    machine_mode,
+    note_scheduled,
+    process_file,
+    reformat,
+    reformat_date,
+)
+from .helpers.ids import new_id
+from .helpers.locks import project_lock, registry_lock
+from .helpers.profiling import begin
+from .helpers.state import session
+from .helpers.store import BufferedStore, get_store
+
+
+def build_parsers() -> dict:
+    parsers = {}
+
+    p = parsers["addto"] = argparse.ArgumentParser(prog="addto", add_help=False, exit_on_error=False)
+    p.add_argument("ref_proj", type=str)
+    p.add_argument("file", type=str, choices=file_options)
+    p.add_argument("pos", nargs="?", default="TAIL")
+    p.add_argument("-entry", type=str, required=True)
+    p.add_argument("-desc", type=str, default="")
+    p.add_argument("-hours", type=float)
+    p.add_argument("-schedule", type=str)
+    p.add_argument("-flag", action=argparse.BooleanOptionalAction, default=False)
+
+    p = parsers["pull"] = argparse.ArgumentParser(prog="pull", add_help=False, exit_on_error=False)
+    p.add_argument("ref_proj", type=str)
+    p.add_argument("file", type=str, choices=file_options)
+    p.add_argument("pos", type=str, nargs="+")
+    p.add_argument("-U", action=argparse.BooleanOptionalAction, default=False)
+
+    p = parsers["move"] = argparse.ArgumentParser(prog="move", add_help=False, exit_on_error=False)
+    p.add_argument("ref_proj", type=str)
+    p.add_argument("file", type=str, choices=file_options)
+    p.add_argument("from", type=str)
+    p.add_argument("to", type=str)
+    p.add_argument("-schedule", type=str)
+
+    p = parsers["rmfrom"] = argparse.ArgumentParser(prog="rmfrom", add_help=False, exit_on_error=False)
+    p.add_argument("ref_proj", type=str)
+    p.add_argument("file", type=str, choices=file_options)
+    p.add_argument("pos", nargs="+")
+
+    p = parsers["edit"] = argparse.ArgumentParser(prog="edit", add_help=False, exit_on_error=False)
+    p.add_argument("ref_proj", type=str)
+    p.add_argument("file", type=str, choices=file_options)
+    p.add_argument("pos", type=str)
+    p.add_argument(
+        "field", type=str, choices=[c for c in columns if c not in ["datetime_created", "datetime_moved", "id"]]
+    )
+    p.add_argument("value", type=str)
+    p.add_argument("-a", action=argparse.BooleanOptionalAction, default=False)
+
+    p = parsers["hideproj"] = argparse.ArgumentParser(prog="hideproj", add_help=False, exit_on_error=False)
+    p.add_argument("project", type=str)
+    p.add_argument("-U", action=argparse.BooleanOptionalAction, default=False)
+
+    return parsers
+
+
+def parse_commands(lines: list) -> list:
+    """Return (line number, verb, args) for every operation, raising on the first malformed line."""
+    parsers = build_parsers()
+    commands = []
+    for n, line in enumerate(lines, start=1):
+        tokens = shlex.split(line, comments=True)
+        if not tokens:
+            continue
+        verb, args = tokens[0], tokens[1:]
+        if verb not in parsers:
+            raise ValueError(reformat(f"Line {n}: unknown operation '{verb}'.", input_type="error"))
+        try:
+            d = vars(parsers[verb].parse_args(args))
+        except (argparse.ArgumentError, SystemExit) as e:
+            raise ValueError(reformat(f"Line {n}: {e}", input_type="error"))
+        commands.append((n, verb, d))
+    return commands
+
+
+def release_time(when: str) -> str:
+    scheduled = reformat_date(when)
+    if scheduled <= datetime.now():
+        raise ValueError(f"Scheduled time {scheduled} is not in the future.")
+    return scheduled.strftime(date_format)
+
+
+def requires_schedule(file: str) -> bool:
+    """Entries in lists with the 'schedule' attr (scheduled) need a release time; batch cannot prompt for one."""
+    return "attrs" in CONFIG[file].keys() and "schedule" in CONFIG[file]["attrs"]
+
+
+def run(verb: str, d: dict, store: BufferedStore, registry: dict, scheduled: list) -> None:
+    """Apply one operation to the buffered store and in-memory registry."""
+    if verb == "hideproj":
+        hide, show = (
+            (registry["hidden"], registry["active"]) if not d["U"] else (registry["active"], registry["hidden"])
+        )
+        if d["project"] not in show:
+            raise ValueError(f"Project '{d['project']}' not found in reference list.")
+        show.remove(d["project"])
+        hide.append(d["project"])
+        return
+
+    project = d["ref_proj"]
+    if project not in registry["active"] + registry["hidden"]:
+        raise ValueError(f"'{project}' is not a valid project.")
+    file = process_file(d["file"])
+
+    if verb == "addto":
+        row = {k: None for k in columns}
+        row.update(
+            entry=d["entry"],
+            description=d["desc"],
+            time_estimate=d["hours"],
+            flagged=d["flag"],
+            datetime_created=datetime.now().strftime(date_format),
+            id=new_id(),
+        )
+        if requires_schedule(file) and not d["schedule"]:
+            raise ValueError(f"'-schedule' must be provided to add an entry to {file}")
+        if d["schedule"]:
+            if "pull_to" not in CONFIG[file].keys():
+                raise ValueError("Cannot schedule an entry to a file with no 'pull_to' parameter.")
+            row["datetime_scheduled"] = release_time(d["schedule"])
+            scheduled.append((project, file, row["datetime_scheduled"]))
+        store.insert(project, file, row, pos=define_store_idx(d["pos"], store, project, file, extra=1))
+
+    elif verb == "pull":
+        key = "pull_to" if not d["U"] else "push_to"
+        if key not in CONFIG[file].keys():
+            raise ValueError(f"No '{key}' file found in 'config.json' for '{file}'.")
+        to_file = CONFIG[file][key]
+        from_df = store.read(project, file)
+        positions = list(dict.fromkeys(define_idx(p, from_df) for p in d["pos"]))
+        for idx in positions:
+            if idx not in from_df.index:
+                raise ValueError(f"Index {idx} not found in project '{project}' file {file}.")
+        store.transfer(project, file, to_file, positions)
+
+    elif verb == "move":
+        if d["to"] not in file_options:
+            from_idx = define_store_idx(d["from"], store, project, file)
+            store.reorder(project, file, from_index=from_idx, to_index=define_store_idx(d["to"], store, project, file))
+            return
+        to_file = process_file(d["to"])
+        from_df = store.read(project, file)
+        idx = define_idx(d["from"], from_df)
+        if idx not in from_df.index:
+            raise ValueError(f"Index {d['from']} not found in project '{project}' file {file}.")
+        values = None
+        if requires_schedule(to_file) and not d["schedule"]:
+            raise ValueError(f"'-schedule' must be provided to move an entry to {to_file}")
+        if d["schedule"]:
+            if "pull_to" not in CONFIG[to_file].keys():
+                raise ValueError("Cannot schedule an entry to a file with no 'pull_to' parameter.")
+            values = {"datetime_scheduled": release_time(d["schedule"])}
+            scheduled.append((project, to_file, values["datetime_scheduled"]))
+        store.transfer(project, file, to_file, [idx], values=values)
+
+    elif verb == "rmfrom":
+        n = store.count(project, file)
+        positions = list(dict.fromkeys(define_store_idx(p, store, project, file) for p in d["pos"]))
+        if any(p not in range(n) for p in positions):
+            raise ValueError(f"Provided index not found in project '{project}' file {file}.")
+        store.delete(project, file, positions)
+
+    elif verb == "edit":
+        df = store.read(project, file)
+        idx = define_idx(d["pos"], df)
+        if idx not in df.index:
+            raise ValueError(f"Provided index not found in project '{project}' file {file}.")
+        field, value = d["field"], d["value"]
+        if d["a"] and field in ["entry", "description"] and isinstance(df.loc[idx, field], str):
+            value = f"{df.loc[idx, field]} | {value}"
+        if field == "time_estimate":
+            value = float(value)
+        elif field == "flagged":
+            value = value.lower() in ["true", "t", "y", "yes", "1"]
+        elif field == "datetime_scheduled":
+            value = float("NaN") if value in ["NaN", "NA", "na", "nan"] else release_time(value)
+            scheduled.append((project, file, value))
+        store.update(project, file, idx, {field: value})
+
+
+def main():
+    begin("batch")
+    check_init()
+
+    parser = argparse.ArgumentParser(description="Run many operations with one load and one save per list.")
+    parser.add_argument(
+        "path",
+        type=str,
+        nargs="?",
+        help="File of operations, one per line. Read from stdin if omitted.",
+    )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, print the result as JSON instead of redrawing the list.",
+    )
+    d = vars(parser.parse_args())
+
+    lines = open(d["path"], "r").read().splitlines() if d["path"] else sys.stdin.read().splitlines()
+    commands = parse_commands(lines)
+    projects = sorted({c[2]["ref_proj"] for c in commands if "ref_proj" in c[2]})
+    # before locking: project_lock would otherwise fail on the missing directory of an unknown project
+    known = session.registry(fresh=True)
+    for n, verb, args in commands:
+        if "ref_proj" in args and args["ref_proj"] not in known["active"] + known["hidden"]:
+            raise ValueError(
+                reformat(
+                    f"Line {n} ({verb}): '{args['ref_proj']}' is not a valid project. No changes were written.",
+                    input_type="error",
+                )
+            )
+
+    store = BufferedStore(get_store())
+    scheduled = []
+    with ExitStack() as stack:
+        # lock in a fixed order so concurrent batches cannot deadlock
+        if any(verb == "hideproj" for _, verb, _ in commands):
+            stack.enter_context(registry_lock())
+        for project in projects:
+            stack.enter_context(project_lock(project))
+
+        registry = session.registry(fresh=True)
+        hidden_before = list(registry["hidden"])
+        for n, verb, args in commands:
+            try:
+                run(verb, args, store, registry, scheduled)
+            except (ValueError, IndexError, KeyError) as e:
+                raise ValueError(reformat(f"Line {n} ({verb}): {e}. No changes were written.", input_type="error"))
+
+        written = store.flush()
+        for project, file, when in scheduled:
+            note_scheduled(project, file, when)
+        if registry["hidden"] != hidden_before:
+            session.save_registry(active=registry["active"], hidden=registry["hidden"])
+
+    if machine_mode():
+        emit(
+            {
+                "command": "batch",
+                "operations": len(commands),
+                "written": [{"project": project, "file": file} for project, file in written],
+            }
+        )
+        return
+    print(reformat(f"{len(commands)} operations applied. {len(written)} lists written."))
+    lst.main(parse_args=False)
+
+
+if __name__ == "__main__":
+    main()
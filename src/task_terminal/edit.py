@@ -3,46 +3,50 @@
 Edit list item.
 
 $ edit PROJECT LIST IDX
+$ edit PROJECT LIST IDX -field FIELD -value VALUE -json
 """
 
 # base imports
 import argparse
-import json
-from datetime import datetime
-
-import numpy as np
-import pandas as pd
-
-pd.options.mode.chained_assignment = None
 from contextlib import suppress
+from datetime import datetime
 
 from task_terminal import lst
 
+from .helpers.daemon import forward
 from .helpers.helpers import (
     CONFIG,
+    ask,
     check_init,
-    data_path,
     define_idx,
+    emit,
     file_options,
     halftab,
-    pkg_path,
+    machine_mode,
+    note_scheduled,
     process_file,
     reformat,
     reformat_date,
+    relocate,
     set_entry_size,
     set_entry_size_manual,
     split_to_width,
     timed_sleep,
 )
-
-# establish parameters
-templates = json.load(open(f"{pkg_path}/helpers/templates.json"))
-project_list = json.load(open(f"{data_path}/project_list.json", "r"))
+from .helpers.locks import project_lock
+from .helpers.state import session
+from .helpers.store import get_store
 
 
 def main():
+    if forward("edit"):
+        return
     check_init()
 
+    # establish parameters
+    templates = session.templates
+    project_list = session.projects
+
     # establish parser to pull in projects to view
     parser = argparse.ArgumentParser(description="Edit list item.")
     parser.add_argument(
@@ -62,7 +66,7 @@ def main():
     parser.add_argument(
         "pos",
         nargs="?",
-        help="Position from which to remove task. Accepted arguments are zero / positive integer indices, 'HEAD', and 'TAIL'.",
+        help="Position from which to remove task. Accepted arguments are zero / positive integer indices, 'HEAD', 'TAIL', and entry IDs.",
     )
     parser.add_argument(
         "-a",
@@ -70,6 +74,22 @@ def main():
         default=False,
         help="If provided, get additions to append to entry.",
     )
+    parser.add_argument(
+        "-field",
+        type=str,
+        help="Name of the field to edit (e.g. 'entry', 'time_estimate'). Prompted for if not provided.",
+    )
+    parser.add_argument(
+        "-value",
+        type=str,
+        help="New value (or text to append with -a). Prompted for if not provided.",
+    )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, run non-interactively (all values from flags) and print the result as JSON.",
+    )
     d = vars(parser.parse_args())
 
     if len(project_list) == 0:
@@ -103,13 +123,17 @@ def main():
             )
         )
 
+    import numpy as np
+    import pandas as pd
+
+    pd.options.mode.chained_assignment = None
+
     file_name = process_file(d["file"])
 
-    base_path = f"{data_path}/projects/{d['ref_proj']}"
-    path = f"{base_path}/{file_name}.csv"
-    df = pd.read_csv(path)
+    store = get_store()
+    df = store.read(d["ref_proj"], file_name)
     idx = define_idx(d["pos"], df)
-    if idx not in list(df.index):
+    if idx not in df.index:
         raise ValueError(
             reformat(
                 f"Provided index not found in project '{d['ref_proj']}' file {file_name}.",
@@ -118,7 +142,7 @@ def main():
         )
     to_be_edited = df.iloc[idx]
     non_editable = (
-        ["datetime_created", "datetime_moved"]
+        ["datetime_created", "datetime_moved", "id"]
         if not d["a"]
         else [
             "time_estimate",
@@ -126,6 +150,7 @@ def main():
             "datetime_created",
             "datetime_moved",
             "datetime_scheduled",
+            "id",
         ]
     )
     to_be_edited.index = [f"{c} ({i})" if c not in non_editable else c for i, c in enumerate(to_be_edited.index)]
@@ -134,17 +159,24 @@ def main():
         if not d["a"]
         else "To which item would you like to append (enter index)"
     )
-    set_entry_size(
-        to_be_edited,
-        min_width=len(q_str) + 5,
-        max_width=76,
-        additional_height=5,
-        additional_width=27,
-    )
-    val_idx = None
-    while not type(val_idx) is int:
-        with suppress(ValueError):
-            val_idx = int(input(f"\n{halftab}{q_str}?\n\n{to_be_edited}\n{halftab}"))
+    if d["field"] is not None:
+        if d["field"] not in list(df.columns):
+            raise ValueError(reformat(f"'-field' must be one of {list(df.columns)}.", input_type="error"))
+        val_idx = list(df.columns).index(d["field"])
+    else:
+        set_entry_size(
+            to_be_edited,
+            min_width=len(q_str) + 5,
+            max_width=76,
+            additional_height=5,
+            additional_width=27,
+        )
+        if machine_mode():
+            ask(q_str, "-field")
+        val_idx = None
+        while not type(val_idx) is int:
+            with suppress(ValueError):
+                val_idx = int(input(f"\n{halftab}{q_str}?\n\n{to_be_edited}\n{halftab}"))
     if to_be_edited.index[val_idx].split(" ")[0] in non_editable:
         raise ValueError(
             reformat(
@@ -152,43 +184,65 @@ def main():
                 input_type="error",
             )
         )
-    edit_lines = split_to_width(str(to_be_edited[val_idx]), linelen=50)
-    set_entry_size_manual(6 + len(edit_lines), np.max([len(l) for l in edit_lines]) + 10)
-    print(f"\n{halftab}{to_be_edited.index[val_idx].split(' ')[0].capitalize()} was:")
-    [print(f"{halftab}{l}") for l in edit_lines]
-    print(f"{halftab}{type(to_be_edited[val_idx])}\n")
+    old_value = shown_value = to_be_edited.iloc[val_idx]
     is_date = "datetime" in to_be_edited.index[val_idx]
+    if to_be_edited.index[val_idx][:4] == "desc" and pd.isna(old_value):
+        old_value = ""
+    if d["value"] is None and not machine_mode():
+        edit_lines = split_to_width(str(old_value), linelen=50)
+        set_entry_size_manual(6 + len(edit_lines), np.max([len(l) for l in edit_lines]) + 10)
+        print(f"\n{halftab}{to_be_edited.index[val_idx].split(' ')[0].capitalize()} was:")
+        [print(f"{halftab}{l}") for l in edit_lines]
+        print(f"{halftab}{type(old_value)}\n")
     q_str = "What would you like to replace it with?" if not d["a"] else "What would you like to append?"
-    if to_be_edited.index[val_idx][:4] == "desc" and pd.isna(to_be_edited[val_idx]):
-        to_be_edited[val_idx] = ""
     new_value = None
-    while not (type(new_value) == type(to_be_edited[val_idx]) and not is_date) and not (
-        (type(new_value) is datetime) and is_date
-    ):
+    while not (type(new_value) == type(old_value) and not is_date) and not ((type(new_value) is datetime) and is_date):
+        if d["value"] is not None and new_value is not None:
+            raise ValueError(reformat(f"'-value' {d['value']} is not valid for this field.", input_type="error"))
+        answer = d["value"] if d["value"] is not None else ask(q_str, "-value")
         with suppress(ValueError):
-            new_value = input(
-                reformat(
-                    q_str,
-                    input_type="input",
-                )
-            )
-            if d["a"] and to_be_edited[val_idx]:
-                new_value = f"{to_be_edited[val_idx]} | {new_value}"
+            new_value = answer
+            if d["a"] and old_value:
+                new_value = f"{old_value} | {new_value}"
 
-            if "datetime" in to_be_edited.index[val_idx]:
+            if is_date:
                 if new_value in ["NaN", "NA", "na", "nan"]:
                     new_value = float("NaN")
                     break
                 new_value = reformat_date(new_value)
             else:
-                new_value = type(to_be_edited[val_idx])(new_value)
+                new_value = type(old_value)(new_value)
 
     if is_date and not pd.isna(new_value):
         new_value = new_value.strftime("%m/%d/%Y %H:%M:%S")
-    to_be_edited.iloc[val_idx] = new_value
-    df.iloc[idx] = to_be_edited.tolist()
-    df.to_csv(path, index=False)
-
+    with project_lock(d["ref_proj"]):
+        # the list was read before the prompts: find the entry again, and keep an edit made meanwhile
+        [idx] = relocate(store, d["ref_proj"], file_name, [df.loc[idx, "id"]])
+        [(_, current)] = store.iter_rows(d["ref_proj"], file_name, idx, idx + 1)
+        now_value = current[df.columns[val_idx]]
+        if not (pd.isna(now_value) and pd.isna(shown_value) or now_value == shown_value):
+            raise ValueError(
+                reformat(
+                    f"'{df.columns[val_idx]}' of item {idx} was changed while waiting for input. Nothing was changed.",
+                    input_type="error",
+                )
+            )
+        store.update(d["ref_proj"], file_name, idx, {df.columns[val_idx]: new_value})
+        if df.columns[val_idx] == "datetime_scheduled":
+            note_scheduled(d["ref_proj"], file_name, new_value)
+
+    if machine_mode():
+        emit(
+            {
+                "command": "edit",
+                "project": d["ref_proj"],
+                "file": file_name,
+                "pos": idx,
+                "field": df.columns[val_idx],
+                "value": new_value,
+            }
+        )
+        return
     print(reformat("Item successfully edited."))
 
     timed_sleep()
@@ -0,0 +1,176 @@
+# base imports
+from __future__ import annotations
+
+import io
+import json
+import os
+from datetime import datetime, timedelta
+
+from .helpers import CONFIG_FULL, data_path, date_format, load_json
+from .locks import atomic_write, write_json
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+columnar_path = f"{data_path}/.cache/columns"
+time_columns = ["datetime_created", "datetime_moved", "datetime_scheduled"]
+array_columns = ["time_estimate", "flagged"] + time_columns
+missing_time = -(2**63)  # NaT as int64: epoch seconds for missing times
+epoch_start = datetime(1970, 1, 1)
+
+
+def enabled() -> bool:
+    """Sidecars are kept only when the top-level 'columnar' key of config.json is true."""
+    return bool(CONFIG_FULL.get("columnar", False))
+
+
+def list_dir(project: str, file: str) -> str:
+    return f"{columnar_path}/{project}/{file}"
+
+
+def token(store, project: str, file: str):
+    version = store.version(project, file)
+    return json.dumps(version) if version is not None else None
+
+
+def encode(df: pd.DataFrame) -> dict:
+    """Fixed-width arrays of a list: time_estimate (float64, NaN if unset), flagged (bool) and the datetime columns
+    (int64 epoch seconds, 'missing_time' if unset)."""
+    import numpy as np
+    import pandas as pd
+
+    arrays = {
+        "time_estimate": pd.to_numeric(df["time_estimate"], errors="coerce").to_numpy(dtype=np.float64),
+        "flagged": df["flagged"].eq(True).to_numpy(dtype=bool),
+    }
+    for column in time_columns:
+        times = pd.to_datetime(df[column], format=date_format, errors="coerce").astype("datetime64[s]")
+        arrays[column] = times.to_numpy().astype(np.int64)
+    return arrays
+
+
+def encode_row(row: dict) -> dict:
+    return {column: value[0] for column, value in encode(rows_frame([row])).items()}
+
+
+def rows_frame(rows: list) -> pd.DataFrame:
+    import pandas as pd
+
+    return pd.DataFrame([{column: row.get(column) for column in array_columns} for row in rows], columns=array_columns)
+
+
+def epoch(when: datetime) -> int:
+    import numpy as np
+
+    return int(np.datetime64(when, "s").astype(np.int64))
+
+
+def save(project: str, file: str, arrays: dict, version: str) -> None:
+    """Write each array as .npy, then 'meta.json' with the list version they reflect. Until meta.json is replaced the
+    old version stays recorded, so a half-written sidecar is never trusted."""
+    import numpy as np
+
+    os.makedirs(list_dir(project, file), exist_ok=True)
+    for column, values in arrays.items():
+        buffer = io.BytesIO()
+        np.save(buffer, np.ascontiguousarray(values))
+        atomic_write(f"{list_dir(project, file)}/{column}.npy", buffer.getvalue())
+    write_json(f"{list_dir(project, file)}/meta.json", {"version": version})
+
+
+def saved_version(project: str, file: str):
+    path = f"{list_dir(project, file)}/meta.json"
+    return load_json(path)["version"] if os.path.isfile(path) else None
+
+
+def load(store, project: str, file: str):
+    """Read-only memory-mapped arrays of one list, rebuilt from the list if they are missing or stale. None when
+    sidecars are disabled or the store cannot report versions."""
+    if not enabled():
+        return None
+    version = token(store, project, file)
+    if version is None:
+        return None
+    if saved_version(project, file) != version:
+        save(project, file, encode(store.read(project, file)), version)
+    return mapped(project, file)
+
+
+def mapped(project: str, file: str) -> dict:
+    import numpy as np
+
+    return {column: np.load(f"{list_dir(project, file)}/{column}.npy", mmap_mode="r") for column in array_columns}
+
+
+def apply_arrays(arrays: dict, op: dict) -> dict:
+    """The arrays after one row-level op (see store.apply_op)."""
+    import numpy as np
+
+    arrays = {column: np.array(values) for column, values in arrays.items()}
+    n = len(arrays["flagged"])
+    if op["op"] == "insert":
+        row = encode_row(op["row"])
+        pos = n if op["pos"] == -1 else min(op["pos"], n)
+        return {column: np.insert(values, pos, row[column]) for column, values in arrays.items()}
+    elif op["op"] == "update":
+        row = encode_row(op["values"])
+        for column in set(op["values"]) & set(array_columns):
+            arrays[column][op["pos"]] = row[column]
+        return arrays
+    elif op["op"] == "delete":
+        return {column: np.delete(values, op["positions"]) for column, values in arrays.items()}
+    elif op["op"] == "append":
+        rows = encode(rows_frame(op["rows"]))
+        return {column: np.concatenate([values, rows[column]]) for column, values in arrays.items()}
+    elif op["op"] == "reorder":
+        from_index = n - 1 if op["from"] == -1 else op["from"]
+        if not 0 <= from_index < n:
+            raise ValueError(f"Index {op['from']} not found in a list of {n} entries.")
+        to_index = n - 1 if op["to"] == -1 else min(op["to"], n - 1)
+        order = list(range(n))
+        order.insert(to_index, order.pop(from_index))
+        return {column: values[order] for column, values in arrays.items()}
+    raise ValueError(f"Unknown op '{op['op']}'.")
+
+
+def update_columns(store, project: str, file: str, op: dict) -> None:
+    """Store hook: keep a list's sidecar current. Row-level ops are applied to the arrays when the sidecar matched
+    the list before the change; otherwise it is left stale and rebuilt on next use."""
+    if op["op"] == "remove":
+        if os.path.isdir(f"{columnar_path}/{project}"):
+            from shutil import rmtree
+
+            rmtree(f"{columnar_path}/{project}")
+        return
+    if not enabled() or op["op"] == "create":
+        return
+    version = token(store, project, file)
+    if version is None:
+        return
+    if op["op"] == "write":
+        save(project, file, encode(op["df"]), version)
+    elif op.get("before") is not None and saved_version(project, file) == json.dumps(op["before"]):
+        save(project, file, apply_arrays(mapped(project, file), op), version)
+
+
+def stats(arrays: dict) -> dict:
+    """stats.list_stats from the arrays alone."""
+    import numpy as np
+
+    scheduled = arrays["datetime_scheduled"][arrays["datetime_scheduled"] != missing_time]
+    return {
+        "n": len(arrays["flagged"]),
+        "total": round(float(np.nansum(arrays["time_estimate"])), 2),
+        "flagged": int(np.count_nonzero(arrays["flagged"])),
+        "next_scheduled": (
+            (epoch_start + timedelta(seconds=int(scheduled.min()))).isoformat() if len(scheduled) else None
+        ),
+    }
+
+
+def due(arrays: dict, now: datetime) -> np.ndarray:
+    """Mask of entries scheduled before 'now'."""
+    scheduled = arrays["datetime_scheduled"]
+    return (scheduled != missing_time) & (scheduled < epoch(now))
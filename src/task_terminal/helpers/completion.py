@@ -0,0 +1,212 @@
+# base imports
+import os
+from bisect import bisect_left
+
+# Shell completion (see taskcomplete.py) is answered from plain-text files under '{data_path}/.cache/completion', so
+# a completion request imports nothing beyond os and bisect (json or contextlib alone costs more than the lookup).
+# 'projects' and 'hidden' hold the sorted project names, 'lists' the sorted list names and aliases ('name file' lines)
+# and 'lengths/{project}' one 'file n' line per list. Each names file starts with the stat of the JSON it was built
+# from and is rebuilt when that no longer matches; registry changes rewrite it directly (Session.save_registry), and
+# the update_lengths store hook keeps list lengths current.
+pkg_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_path = os.environ.get("TASK_TERMINAL_DATA", f"{pkg_path}/.package_data")  # helpers.data_path, without its imports
+cache_path = f"{data_path}/.cache/completion"
+sources = {
+    "projects": f"{data_path}/project_list.json",
+    "hidden": f"{data_path}/hidden_project_list.json",
+    "lists": f"{pkg_path}/helpers/config.json",
+}
+
+# positional arguments of each command, in order; a trailing '...' repeats. Flags taking a value, and what it is.
+grammar = {
+    "lst": ["project_or_all", "list", "position"],
+    "addto": ["project", "list", "position"],
+    "edit": ["project", "list", "position"],
+    "pull": ["project", "list", "position..."],
+    "rmfrom": ["project", "list", "position..."],
+    "move": ["project", "list", "position", "position_or_list"],
+    "hideproj": ["project"],
+    "rmproj": ["any_project"],
+    "moveproj": ["project_position", "project_position"],
+    "search": [],
+}
+value_flags = {
+    "-entry": None,
+    "-description": None,
+    "-hours": None,
+    "-when": None,
+    "-field": None,
+    "-value": None,
+    "-limit": None,
+    "-offset": None,
+    "-tail": None,
+    "-since": None,
+    "-list": "list",
+}
+
+
+def stat_key(path: str) -> str:
+    stat = os.stat(path)
+    return f"{stat.st_ino} {stat.st_mtime_ns} {stat.st_size}"
+
+
+def save_names(kind: str, lines: list) -> None:
+    """Write one names file, sorted, headed by the current stat of its source."""
+    from .locks import atomic_write
+
+    os.makedirs(cache_path, exist_ok=True)
+    atomic_write(f"{cache_path}/{kind}", "\n".join([stat_key(sources[kind])] + sorted(lines)) + "\n")
+
+
+def names(kind: str) -> list:
+    """Sorted lines of a names file, rebuilt first if its source changed since it was written."""
+    try:
+        with open(f"{cache_path}/{kind}", "r") as f:
+            header, *lines = f.read().splitlines()
+        if header == stat_key(sources[kind]):
+            return lines
+    except (FileNotFoundError, ValueError):
+        pass
+
+    import json
+
+    if kind == "lists":
+        from .graph import graph
+
+        lines = [f"{name} {file}" for name, file in graph()["aliases"].items()]
+    else:
+        lines = json.load(open(sources[kind], "r"))
+    save_names(kind, lines)
+    return sorted(lines)
+
+
+def lengths(project: str) -> dict:
+    """{file: number of entries} for the lists of 'project' that have been changed since the cache existed."""
+    try:
+        with open(f"{cache_path}/lengths/{project}", "r") as f:
+            return {file: int(n) for file, n in (line.split(" ") for line in f.read().splitlines())}
+    except FileNotFoundError:
+        return {}
+
+
+def save_lengths(project: str, known: dict) -> None:
+    from .locks import atomic_write
+
+    os.makedirs(f"{cache_path}/lengths", exist_ok=True)
+    atomic_write(f"{cache_path}/lengths/{project}", "".join(f"{file} {n}\n" for file, n in known.items()))
+
+
+def update_lengths(store, project: str, file: str, op: dict) -> None:
+    """Store hook: keep the project's list lengths current (see the comment at the top of this module)."""
+    if op["op"] == "remove":
+        if os.path.isfile(f"{cache_path}/lengths/{project}"):
+            os.remove(f"{cache_path}/lengths/{project}")
+        return
+    if op["op"] == "create":
+        save_lengths(project, {})
+        return
+    if op["op"] not in ["write", "insert", "append", "delete"]:
+        return
+    known = lengths(project)
+    if op["op"] == "write":
+        known[file] = len(op["df"])
+    elif file in known and op["op"] == "append":
+        known[file] += len(op["rows"])
+    elif file in known:
+        known[file] += 1 if op["op"] == "insert" else -len(set(op["positions"]))
+    else:
+        known[file] = store.count(project, file)
+    save_lengths(project, known)
+
+
+def rebuild(store, projects: list) -> int:
+    """Recount every list of 'projects' and rewrite all names files. Returns the number of lists counted."""
+    from .graph import config
+
+    os.makedirs(cache_path, exist_ok=True)
+    for kind in sources:
+        if os.path.isfile(f"{cache_path}/{kind}"):
+            os.remove(f"{cache_path}/{kind}")
+        names(kind)
+    files = list(config()["files"])
+    for project in projects:
+        save_lengths(project, {file: store.count(project, file) for file in files})
+    return len(projects) * len(files)
+
+
+def prefixed(lines: list, prefix: str) -> list:
+    """The lines of sorted 'lines' that start with 'prefix', found by bisection."""
+    return lines[bisect_left(lines, prefix) : bisect_left(lines, prefix + "\U0010ffff")]
+
+
+def numbers(n: int, prefix: str) -> list:
+    """Decimal strings of 0..n-1 starting with 'prefix', generated from the ranges that share it (p, p0-p9, ...)."""
+    if not prefix:
+        return [str(i) for i in range(n)]
+    if not prefix.isdigit() or (prefix[0] == "0" and len(prefix) > 1):
+        return []
+    found = []
+    low, high = int(prefix), int(prefix) + 1
+    while low < n and (low or len(found) == 0):
+        found += [str(i) for i in range(low, min(high, n))]
+        low, high = low * 10, high * 10
+    return found
+
+
+def positions(project: str, name: str, prefix: str) -> list:
+    files = dict(line.split(" ") for line in names("lists"))
+    n = lengths(project).get(files.get(name))
+    return [p for p in ["HEAD", "TAIL"] if p.startswith(prefix)] + (numbers(n, prefix) if n is not None else [])
+
+
+def candidates(slot: str, positional: list, prefix: str) -> list:
+    if slot in ["project", "project_or_all"]:
+        found = prefixed(names("projects"), prefix)
+        return found + prefixed(["ALL", "all"], prefix) if slot == "project_or_all" else found
+    elif slot in ["hidden", "any_project"]:
+        found = prefixed(names("hidden"), prefix)
+        return found + prefixed(names("projects"), prefix) if slot == "any_project" else found
+    elif slot == "list":
+        return list(dict.fromkeys(line.split(" ")[0] for line in prefixed(names("lists"), prefix)))
+    elif slot == "position":
+        return positions(positional[0], positional[1], prefix)
+    elif slot == "position_or_list":
+        return positions(positional[0], positional[1], prefix) + candidates("list", positional, prefix)
+    elif slot == "project_position":
+        return [p for p in ["HEAD", "TAIL"] if p.startswith(prefix)] + numbers(len(names("projects")), prefix)
+    return []
+
+
+def complete(words: list) -> list:
+    """Candidates for the last of 'words', a command line up to the cursor (command first, current word last)."""
+    command, *args = words
+    command = os.path.basename(command).removesuffix(".py")
+    if command not in grammar or not args:
+        return []
+    *done, current = args
+
+    positional = []
+    value_of = False
+    for word in done:
+        if value_of is not False:
+            value_of = False
+        elif word in value_flags:
+            value_of = value_flags[word]
+        elif not word.startswith("-"):
+            positional.append(word)
+    if value_of is not False:
+        return candidates(value_of, positional, current) if value_of else []
+    if current.startswith("-"):
+        return []
+
+    slots = grammar[command]
+    if command == "hideproj" and "-U" in done:
+        slots = ["hidden"]
+    if len(positional) >= len(slots) and not (slots and slots[-1].endswith("...")):
+        return []
+    slot = slots[min(len(positional), len(slots) - 1)].removesuffix("...")
+    try:
+        return candidates(slot, positional, current)
+    except OSError:
+        # not initialised yet (no registry), or a list or project that does not exist
+        return []
@@ -0,0 +1,207 @@
+# base imports
+import importlib
+import io
+import json
+import os
+import sys
+
+from .helpers import data_path, halftab, machine_mode
+from .profiling import begin
+from .profiling import enabled as profiling
+
+# every command imports this module to call forward(); socket, selectors and traceback are imported only once a
+# daemon socket exists, so commands that fall back to direct file access do not pay for them
+socket_path = f"{data_path}/taskd.sock"
+commands = [
+    "addproj",
+    "addto",
+    "edit",
+    "hideproj",
+    "lsproj",
+    "lst",
+    "move",
+    "moveproj",
+    "pull",
+    "rmfrom",
+    "rmproj",
+    "search",
+]
+
+
+def forward(command: str, argv: list = None) -> bool:
+    """Run 'command' in the resident daemon, relaying stdin / stdout / stderr.
+
+    Returns False when no daemon is listening (or TASK_TERMINAL_NO_DAEMON is set, or the command is being profiled) so
+    the caller can fall back to direct file access. Exits with the command's exit code otherwise.
+    """
+    begin(command)
+    # a profiled command runs in this process, so its phases are the ones measured
+    if os.environ.get("TASK_TERMINAL_NO_DAEMON") or profiling or not os.path.exists(socket_path):
+        return False
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return False
+
+    request = {
+        "command": command,
+        "argv": sys.argv[1:] if argv is None else argv,
+        "tty": sys.stdout.isatty(),
+        # TASK_TERMINAL_MACHINE is in this process's environment, not the daemon's
+        "machine": machine_mode(),
+    }
+    sock.sendall((json.dumps(request) + "\n").encode())
+    code = relay(sock)
+    sock.close()
+    if code:
+        sys.exit(code)
+    return True
+
+
+def relay(sock) -> int:
+    """Pump client stdin to the daemon and daemon frames to stdout / stderr until an exit frame arrives."""
+    import selectors
+    import socket
+
+    sel = selectors.DefaultSelector()
+    sel.register(sock, selectors.EVENT_READ)
+    stdin_fd = sys.stdin.fileno() if sys.stdin else None
+    if stdin_fd is not None:
+        try:
+            sel.register(stdin_fd, selectors.EVENT_READ)
+        except (PermissionError, ValueError):
+            # regular files cannot be polled; send them whole
+            sock.sendall(sys.stdin.buffer.read())
+            sock.shutdown(socket.SHUT_WR)
+
+    buffer = b""
+    while True:
+        for key, _ in sel.select():
+            if key.fileobj is sock:
+                data = sock.recv(65536)
+                if not data:
+                    print(f"{halftab}Daemon closed the connection.", file=sys.stderr)
+                    return 1
+                buffer += data
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    frame = json.loads(line)
+                    if "exit" in frame:
+                        return frame["exit"]
+                    stream = sys.stdout if "out" in frame else sys.stderr
+                    stream.write(frame.get("out", frame.get("err")))
+                    stream.flush()
+            else:
+                data = os.read(stdin_fd, 65536)
+                if data:
+                    sock.sendall(data)
+                else:
+                    sel.unregister(stdin_fd)
+                    sock.shutdown(socket.SHUT_WR)
+
+
+class Relay(io.TextIOBase):
+    """Server-side stand-in for sys.stdout / sys.stderr that frames writes back to the client."""
+
+    def __init__(self, wfile, key: str, tty: bool):
+        self.wfile = wfile
+        self.key = key
+        self.tty = tty
+
+    def write(self, s):
+        if s:
+            self.wfile.write(json.dumps({self.key: s}) + "\n")
+            self.wfile.flush()
+        return len(s)
+
+    def isatty(self):
+        return self.tty
+
+
+def serve() -> None:
+    """Accept one client at a time and run its command in this process, keeping imports and lists in memory."""
+    import socket
+
+    from .store import CachedStore, get_store, set_store
+
+    set_store(CachedStore(get_store()))
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    os.chmod(socket_path, 0o600)
+    server.listen()
+    print(f"{halftab}Listening on {socket_path}.", flush=True)
+
+    try:
+        running = True
+        while running:
+            conn, _ = server.accept()
+            with conn:
+                running = handle(conn)
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def handle(conn) -> bool:
+    """Serve a single request. Returns False once a 'stop' request has been answered."""
+    import traceback
+
+    from .state import session
+
+    rfile = conn.makefile("r", encoding="utf-8")
+    wfile = conn.makefile("w", encoding="utf-8")
+    try:
+        request = json.loads(rfile.readline())
+    except ValueError:
+        return True
+
+    if request["command"] == "stop":
+        wfile.write(json.dumps({"exit": 0}) + "\n")
+        wfile.flush()
+        return False
+    if request["command"] not in commands:
+        wfile.write(json.dumps({"err": f"{halftab}Unknown command '{request['command']}'.\n"}) + "\n")
+        wfile.write(json.dumps({"exit": 2}) + "\n")
+        wfile.flush()
+        return True
+
+    saved = sys.argv, sys.stdin, sys.stdout, sys.stderr
+    sys.argv = [request["command"]] + request["argv"]
+    sys.stdin = rfile
+    sys.stdout = Relay(wfile, "out", request.get("tty", False))
+    sys.stderr = Relay(wfile, "err", request.get("tty", False))
+    os.environ["TASK_TERMINAL_NO_DAEMON"] = "1"
+    machine = os.environ.pop("TASK_TERMINAL_MACHINE", None)
+    if request.get("machine"):
+        os.environ["TASK_TERMINAL_MACHINE"] = "1"
+    # other clients may have changed the registry since the last request
+    session.reset()
+    code = 0
+    try:
+        importlib.import_module(f"task_terminal.{request['command']}").main()
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        traceback.print_exc()
+        code = 1
+    finally:
+        sys.argv, sys.stdin, sys.stdout, sys.stderr = saved
+        del os.environ["TASK_TERMINAL_NO_DAEMON"]
+        os.environ.pop("TASK_TERMINAL_MACHINE", None)
+        if machine is not None:
+            os.environ["TASK_TERMINAL_MACHINE"] = machine
+
+    try:
+        wfile.write(json.dumps({"exit": code}) + "\n")
+        wfile.flush()
+    except OSError:
+        pass
+    return True
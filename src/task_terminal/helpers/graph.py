@@ -0,0 +1,103 @@
+# base imports
+import json
+import os
+
+config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+# config.json as loaded, and the structure compiled from it. Both are refreshed in place when the file changes, so
+# modules holding references to them (helpers.CONFIG, helpers.file_options) see the new values.
+_config = {}
+_graph = {}
+_key = None
+
+
+def compile_graph(files: dict) -> dict:
+    """Compile the 'files' section of config.json, validating it.
+
+    Returns the alias -> file map ('aliases', names included), every accepted list name in config order ('options'),
+    the 'pull_to' / 'push_to' adjacency, every sender into each file ('senders'), the full pull chain through each
+    file ('chains': all upstream senders, each before the files it sends to, then the file and its pull_to
+    successors), and which files carry 'stat' and 'attrs'.
+    """
+    aliases = {file: file for file in files}
+    for file, spec in files.items():
+        for alias in spec.get("aliases", []):
+            if alias in aliases and aliases[alias] != file:
+                raise ValueError(
+                    f"Alias(es) {[alias]} are shared by multiple files. Aliases must be unique to files to avoid ambiguity."
+                )
+            aliases[alias] = file
+
+    adjacency = {}
+    for key in ["pull_to", "push_to"]:
+        adjacency[key] = {file: spec[key] for file, spec in files.items() if key in spec}
+        for file, target in adjacency[key].items():
+            if target not in files:
+                raise ValueError(f"'{key}' of '{file}' in config.json names '{target}', which is not a file.")
+    pull_to = adjacency["pull_to"]
+
+    for file in files:
+        seen = [file]
+        while seen[-1] in pull_to:
+            if pull_to[seen[-1]] in seen:
+                raise ValueError(f"'pull_to' in config.json forms a cycle: {' -> '.join(seen + [pull_to[seen[-1]]])}.")
+            seen.append(pull_to[seen[-1]])
+
+    senders = {file: [f for f in files if pull_to.get(f) == file] for file in files}
+
+    def upstream(file, order):
+        for sender in senders[file]:
+            if sender not in order:
+                upstream(sender, order)
+                order.append(sender)
+        return order
+
+    def downstream(file):
+        chain = [file]
+        while chain[-1] in pull_to:
+            chain.append(pull_to[chain[-1]])
+        return chain
+
+    return {
+        "aliases": aliases,
+        "options": list(files) + [alias for spec in files.values() for alias in spec.get("aliases", [])],
+        "pull_to": pull_to,
+        "push_to": adjacency["push_to"],
+        "senders": senders,
+        "chains": {file: upstream(file, []) + downstream(file) for file in files},
+        "stat": {file: spec["stat"] for file, spec in files.items() if "stat" in spec},
+        "attrs": {file: spec["attrs"] for file, spec in files.items() if "attrs" in spec},
+    }
+
+
+def refresh() -> None:
+    """(Re)load and compile config.json if it changed since it was last compiled in this process."""
+    global _key
+    stat = os.stat(config_path)
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if key == _key:
+        return
+    new = json.load(open(config_path, "r"))
+    compiled = compile_graph(new["files"])
+
+    files = _config.get("files", {})
+    files.clear()
+    files.update(new["files"])
+    _config.clear()
+    _config.update(new, files=files)
+
+    options = _graph.get("options", [])
+    options[:] = compiled["options"]
+    _graph.clear()
+    _graph.update(compiled, options=options)
+    _key = key
+
+
+def config() -> dict:
+    refresh()
+    return _config
+
+
+def graph() -> dict:
+    refresh()
+    return _graph
@@ -1,25 +1,31 @@
 # base imports
+# NOTE: numpy, pandas, dateutil, parse and termcolor are imported inside the functions that need them so that
+# console scripts (and their '--help' / completion probes) do not pay for them at startup. For the same reason paths
+# are built with os.path rather than pathlib, and the helpers modules set TYPE_CHECKING themselves (type checkers
+# accept this) rather than import typing.
+from __future__ import annotations
+
+import copy
 import json
 import os
+import sys
 import time
-import warnings
 from datetime import date as dt
 from datetime import datetime, timedelta
-from pathlib import Path
-
-import numpy as np
-import pandas as pd
-from dateutil.relativedelta import relativedelta
-from parse import parse
-from termcolor import colored
-
-pkg_path = Path(__file__).parents[1]
-data_path = f"{pkg_path}/.package_data"
-project_list = json.load(open(f"{data_path}/project_list.json", "r"))
-CONFIG_FULL = json.load(open(f"{pkg_path}/helpers/config.json", "r"))
+
+from .graph import config, graph
+from .profiling import profiled
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pandas as pd
+
+pkg_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_path = os.environ.get("TASK_TERMINAL_DATA", f"{pkg_path}/.package_data")
+CONFIG_FULL = config()
 DEFAULT_FILE = CONFIG_FULL["default"]
 CONFIG = CONFIG_FULL["files"]
-file_options = list(CONFIG.keys()) + sum([CONFIG[k]["aliases"] for k in CONFIG.keys()], [])
+file_options = graph()["options"]
 columns = [
     "entry",
     "description",
@@ -28,17 +34,64 @@ columns = [
     "datetime_created",
     "datetime_moved",
     "datetime_scheduled",
+    "id",
 ]
 
 halftab = " " * 4
+date_format = "%m/%d/%Y %H:%M:%S"
+render_cache_path = f"{data_path}/.cache/render"
+_json_cache = {}
+
+
+def load_json(path: str):
+    """json.load with an in-process cache revalidated against the file's stat, for long-lived processes."""
+    stat = os.stat(path)
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != key:
+        cached = _json_cache[path] = (key, json.load(open(path, "r")))
+    return copy.deepcopy(cached[1])
+
+
+def machine_mode() -> bool:
+    """True when running non-interactively: TASK_TERMINAL_MACHINE is set or '-json' was passed."""
+    return bool(os.environ.get("TASK_TERMINAL_MACHINE")) or "-json" in sys.argv[1:]
+
 
+def ask(question: str, flag: str) -> str:
+    """Prompt for a value, or in machine mode fail and name the flag that supplies it."""
+    if machine_mode():
+        raise ValueError(reformat(f"'{flag}' must be provided in non-interactive mode.", input_type="error"))
+    return input(reformat(question, input_type="input"))
 
+
+def emit(result: dict) -> None:
+    """Print a command's result as one line of JSON (machine mode)."""
+    from .store import json_value
+
+    print(json.dumps(result, default=json_value))
+
+
+def records(rows) -> list:
+    """Rows of a DataFrame (or an iterable of row dicts) as JSON-ready dicts, with missing values as None."""
+    from .store import sql_value
+
+    rows = rows.to_dict("records") if hasattr(rows, "to_dict") else rows
+    return [{k: sql_value(v) for k, v in row.items()} for row in rows]
+
+
+@profiled("resize")
 def set_entry_size_manual(height, width):
-    os.system("printf '\e[3;0;0t'")
-    os.system(f"printf '\e[8;{height};{width}t'")
+    if machine_mode():
+        return
+    # xterm window ops: move to top-left, then resize to height x width
+    sys.stdout.write(f"\x1b[3;0;0t\x1b[8;{height};{width}t")
+    sys.stdout.flush()
 
 
 def set_entry_size(entry, additional_height=6, additional_width=20, min_width=60, max_width=69):
+    import numpy as np
+
     print_width = np.max(
         [
             min_width,
@@ -68,7 +121,8 @@ def reformat(string: str, input_type: str = None):
 
 
 def timed_sleep(t=1):
-    time.sleep(t)
+    if not machine_mode():
+        time.sleep(t)
 
 
 def print_lines(lines: list, width: int, extra_height=1) -> None:
@@ -78,56 +132,113 @@ def print_lines(lines: list, width: int, extra_height=1) -> None:
     [print(line) for line in lines]
 
 
-def process_file(filename: str):
-    files = CONFIG.keys()
+@profiled("stream")
+def stream_lines(lines, pager=False) -> None:
+    """Print lines as they are produced, without resizing the terminal. With 'pager', pause after every screenful
+    until Enter is pressed; 'q' stops early, so the rest of the list is never read."""
+    import shutil
 
-    if filename in files:
-        return filename
-    else:
-        for file in files:
-            if filename in CONFIG[file]["aliases"]:
-                return file
+    page = max(shutil.get_terminal_size().lines - 1, 1)
+    for n, line in enumerate(lines, start=1):
+        print(line)
+        if pager and n % page == 0 and not machine_mode():
+            if input(f"{halftab}-- more (Enter, or q to quit) --").strip().lower() == "q":
+                return
+
+
+def process_file(filename: str):
+    aliases = graph()["aliases"]
+    if filename in aliases:
+        return aliases[filename]
     raise ValueError(f"File {filename} not found in file names or aliases.")
 
 
-def transfer_row(idx, from_df, to_df):
-    iloc = from_df.index.get_loc(idx)
-    to_be_moved = from_df.iloc[iloc]
-    to_df = to_df.append(to_be_moved.to_dict(), ignore_index=True)
-    from_df = from_df.loc[from_df.index != idx]
+def transfer_rows(positions, from_df, to_df, values: dict = None, now: datetime = None):
+    """Move the rows at 'positions' of 'from_df' to the end of 'to_df', in the order given, with one filter and one
+    concat. Moved rows are stamped 'datetime_moved' (now) and given 'values'. Returns (from_df, to_df, moved)."""
+    import numpy as np
+    import pandas as pd
+
+    moved = from_df.iloc[list(positions)].reset_index(drop=True)
+    stamps = {"datetime_moved": (now or datetime.now()).strftime(date_format), **(values or {})}
+    moved = moved.astype({col: object for col in stamps})
+    for col, value in stamps.items():
+        moved[col] = value
+
+    keep = np.ones(len(from_df), dtype=bool)
+    keep[list(positions)] = False
+    from_df = from_df.loc[keep].reset_index(drop=True)
+    to_df = pd.concat([to_df, moved], ignore_index=True) if len(to_df) else moved
+    return from_df, to_df, moved
+
+
+def load_schedule_index():
+    """Return {project: {file: earliest 'datetime_scheduled' (ISO)}}, or None if the index has not been built yet."""
+    path = f"{data_path}/schedule_index.json"
+    return json.load(open(path, "r")) if os.path.isfile(path) else None
+
 
-    to_df.loc[len(to_df) - 1, "datetime_moved"] = datetime.now().strftime("%m/%d/%Y %H:%M:%S")
+def note_scheduled(project: str, file: str, scheduled) -> None:
+    """Lower the next-due time of a list after an entry is (re)scheduled. 'scheduled' uses 'date_format'."""
+    if not isinstance(scheduled, str):
+        return
+    due = datetime.strptime(scheduled, date_format).isoformat()
+    update_schedule_index(project, lambda entries: {**entries, file: min(due, entries.get(file, due))})
 
-    return from_df, to_df
 
+def update_schedule_index(project: str, update) -> None:
+    """Replace a project's next-due entries with update(entries), if the index exists, under the index lock."""
+    from .locks import file_lock, write_json
 
-def check_scheduled(project_list=project_list):
+    with file_lock(f"{data_path}/.schedule_index.lock"):
+        index = load_schedule_index()
+        if index is not None:
+            index[project] = update(index.get(project, {}))
+            write_json(f"{data_path}/schedule_index.json", index)
 
-    chain_files = [file for file in CONFIG.keys() if "pull_to" in CONFIG[file].keys()]
 
-    moves = {k: 0 for k in project_list}
-    for project in project_list:
-        for file in chain_files:
-            from_path = f"{data_path}/projects/{project}/{file}.csv"
-            to_path = f"{data_path}/projects/{project}/{CONFIG[file]['pull_to']}.csv"
-            from_df = pd.read_csv(from_path)
-            to_df = pd.read_csv(to_path)
+@profiled("check_scheduled")
+def check_scheduled(project_list=None):
+    """Move entries past their 'datetime_scheduled' to 'pull_to'. Each list is read and written at most once.
 
-            for idx, row in enumerate(from_df.to_dict("records")):
-                if pd.isna(row["datetime_scheduled"]):
-                    pass
-                else:
-                    release_time = datetime.strptime(row["datetime_scheduled"], "%m/%d/%Y %H:%M:%S")
-                    # Move if past date
-                    if release_time < datetime.now():
-                        from_df, to_df = transfer_row(idx, from_df, to_df)
-                        from_df.to_csv(from_path, index=False)
-                        to_df.loc[len(to_df) - 1, "datetime_scheduled"] = float("NaN")
-                        to_df.to_csv(to_path, index=False)
-                        moves[project] += 1
+    Lists are only scanned when the next-due index says something is due (or the index does not exist yet). Returns
+    the number of entries released per project.
+    """
+    if project_list is None:
+        from .state import session
+
+        project_list = session.projects
+    now = datetime.now()
+    index = load_schedule_index()
+    if index is not None:
+        now_iso = now.isoformat()
+        due_projects = [p for p in project_list if any(t <= now_iso for t in index.get(p, {}).values())]
+    else:
+        due_projects = project_list
+    if not due_projects:
+        return {}
+
+    from .locks import file_lock, project_lock, write_json
+    from .store import get_store
+
+    store = get_store()
+    chain_files = list(graph()["pull_to"])
+
+    moves = {k: 0 for k in due_projects}
+    new_index = {}
+    for project in due_projects:
+        with project_lock(project):
+            moves[project], entries = release_due(store, project, chain_files, now)
+            if index is not None:
+                update_schedule_index(project, lambda _: entries)
+            else:
+                new_index[project] = entries
+    if index is None:
+        with file_lock(f"{data_path}/.schedule_index.lock"):
+            write_json(f"{data_path}/schedule_index.json", {**(load_schedule_index() or {}), **new_index})
 
     k_w_moves = sum([v > 0 for v in moves.values()])
-    if k_w_moves:
+    if k_w_moves and not machine_mode():
         print("")
         for k, v in moves.items():
             if v > 0:
@@ -136,8 +247,60 @@ def check_scheduled(project_list=project_list):
         print("")
         set_entry_size_manual(height=k_w_moves + 3, width=51)
         timed_sleep(1.5)
-
-
+    return moves
+
+
+def release_due(store, project: str, chain_files: list, now: datetime) -> tuple:
+    """Release one project's due entries. Returns the number moved and the project's new next-due entries.
+
+    With columnar sidecars enabled, lists with nothing due are checked from their arrays and never read."""
+    import pandas as pd
+
+    from . import columnar
+
+    dfs = {}
+    arrays = {}
+    touched = set()
+    moved = 0
+    for file in chain_files:
+        to_file = CONFIG[file]["pull_to"]
+        if file not in dfs:
+            arrays[file] = columnar.load(store, project, file)
+            if arrays[file] is not None and not columnar.due(arrays[file], now).any():
+                continue
+            dfs[file] = store.read(project, file)
+        from_df = dfs[file]
+
+        scheduled = pd.to_datetime(from_df["datetime_scheduled"], format=date_format, errors="coerce")
+        due = (scheduled < now).to_numpy()
+        if not due.any():
+            continue
+
+        if to_file not in dfs:
+            dfs[to_file] = store.read(project, to_file)
+        dfs[file], dfs[to_file], _ = transfer_rows(
+            due.nonzero()[0], from_df, dfs[to_file], values={"datetime_scheduled": float("NaN")}, now=now
+        )
+        touched.update([file, to_file])
+        moved += int(due.sum())
+
+    for file in touched:
+        store.write(project, file, dfs[file])
+
+    entries = {}
+    for file in chain_files:
+        if file not in dfs:
+            next_due = columnar.stats(arrays[file])["next_scheduled"]
+            if next_due is not None:
+                entries[file] = next_due
+            continue
+        next_due = pd.to_datetime(dfs[file]["datetime_scheduled"], format=date_format, errors="coerce").min()
+        if not pd.isna(next_due):
+            entries[file] = next_due.isoformat()
+    return moved, entries
+
+
+@profiled("check_init")
 def check_init() -> None:
     if not os.path.isdir(data_path):
         os.makedirs(data_path)
@@ -145,17 +308,8 @@ def check_init() -> None:
         json.dump([], open(f"{data_path}/hidden_project_list.json", "w"))
         os.makedirs(f"{data_path}/projects")
 
-    # check that aliases are not duplicated across files
-    aliases = []
-    for d in CONFIG.values():
-        aliases += d["aliases"]
-    unique = set(aliases)
-    for a in unique:
-        aliases.remove(a)
-    if aliases:
-        raise ValueError(
-            f"Alias(es) {aliases} are shared by multiple files. Aliases must be unique to files to avoid ambiguity."
-        )
+    # config.json is validated when it is compiled, once per change to the file (see graph.py)
+    graph()
 
 
 def split_to_width(string: str, linelen: int) -> list:
@@ -190,15 +344,13 @@ def parse_row(string: str, linelen: int = 40) -> list:
     return lines
 
 
-def parse_entries(df: pd.DataFrame, project: str, file: str, width: int) -> None:
-    """Print all entries in dataframe."""
+@profiled("render")
+def parse_entries(df: pd.DataFrame, project: str, file: str, width: int, flagged=False, rows: list = None) -> None:
+    """Print all entries in dataframe. 'rows' takes entry lines already rendered by render_lists in place of 'df'."""
     lines = []
     lines += ["", project]
     lines.append("-" * width)
-    if len(df) > 0:
-        for i, row in enumerate(df.to_dict("records")):
-            rowlines_p = process_rowlines(idx=i, row=row, width=width, file=file)
-            lines += rowlines_p
+    lines += rows if rows is not None else render_rows(df, file=file, width=width, flagged=flagged)
     lines.append("-" * width)
 
     stats_str, hour_str = get_project_stats(project, file)
@@ -208,29 +360,106 @@ def parse_entries(df: pd.DataFrame, project: str, file: str, width: int) -> None
     return lines
 
 
+def iter_entries(store, project: str, file: str, width: int, start=0, stop=None, flagged=False, rows=None):
+    """Lines of parse_entries for positions start..stop-1, generated row by row from Store.iter_rows (or from 'rows',
+    (position, row) pairs such as Store.iter_since gives)."""
+    yield ""
+    yield project
+    yield "-" * width
+    for i, row in rows if rows is not None else store.iter_rows(project, file, start, stop):
+        if not flagged or row["flagged"] == True:
+            yield from process_rowlines(idx=i, row=row, width=width, file=file)
+    yield "-" * width
+
+    stats_str, hour_str = get_project_stats(project, file)
+    if stats_str or hour_str:
+        yield f"{stats_str: <{width-10}}{hour_str: <{10}}"
+
+
+def render_rows(df: pd.DataFrame, file: str, width: int, flagged=False) -> list:
+    """Entry lines for one list. With 'flagged', only flagged entries, still numbered by their list position."""
+    lines = []
+    for i, row in enumerate(df.to_dict("records")):
+        if flagged and row["flagged"] != True:
+            continue
+        lines += process_rowlines(idx=i, row=row, width=width, file=file)
+    return lines
+
+
+@profiled("render")
+def render_lists(store, projects: list, file: str, width: int, flagged=False) -> dict:
+    """Rendered entry lines of 'file' per project, cached on disk by the store's version token for the list.
+
+    Only lists whose version changed since they were cached are read and re-rendered (all of them are read at once,
+    see Store.read_many). Stores that report no version are never cached. The cache key includes a hash of the list's
+    config.json entry, so editing e.g. its 'stat' re-renders it.
+    """
+    import hashlib
+
+    from .locks import write_json
+
+    config_hash = hashlib.sha1(json.dumps(CONFIG[file], sort_keys=True).encode()).hexdigest()[:12]
+    key = f"{width}:{int(flagged)}:{config_hash}"
+    blocks, stale = {}, {}
+    for project in projects:
+        version = store.version(project, file)
+        token = json.dumps(version) if version is not None else None
+        path = f"{render_cache_path}/{project}/{file}.json"
+        cache = load_json(path) if os.path.isfile(path) else {}
+        if token is not None and key in cache and cache[key]["version"] == token:
+            blocks[project] = cache[key]["lines"]
+        else:
+            stale[project] = (path, cache, token)
+
+    lists = store.read_many([(project, file) for project in stale])
+    for project, (path, cache, token) in stale.items():
+        blocks[project] = render_rows(lists[(project, file)], file=file, width=width, flagged=flagged)
+        if token is not None:
+            # the version was taken before the read, so a concurrent change can only cause a later miss
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            cache = {k: v for k, v in cache.items() if k.endswith(f":{config_hash}")}
+            cache[key] = {"version": token, "lines": blocks[project]}
+            write_json(path, cache)
+    return blocks
+
+
+def clear_render_cache(store, project: str, file: str, op: dict) -> None:
+    """Store hook: drop a project's cached renders when it is created or removed, since a new project of the same
+    name can restart version counters."""
+    if op["op"] in ["create", "remove"] and os.path.isdir(f"{render_cache_path}/{project}"):
+        from shutil import rmtree
+
+        rmtree(f"{render_cache_path}/{project}")
+
+
 def get_project_stats(project, file):
+    """Footer stats, taken from the project's stats manifest so no other list is read."""
+    from .stats import get_stats
+
     stats_str = ""
     hour_str = ""
     if "stats_from_prev" in CONFIG[file].keys():
         prev_file = CONFIG[file]["push_to"]
-        last_df = pd.read_csv(f"{data_path}/projects/{project}/{prev_file}.csv")
-        stats = {
-            "n": len(last_df),
-            "total": round(np.nansum(last_df["time_estimate"]), 2),
-        }
+        stats = get_stats(project, prev_file)
         lst_stats = [str(stats[c]) if str(stats[c])[-2:] != ".0" else str(stats[c])[:-2] for c in CONFIG[file]["stats_from_prev"]]
         lst_stats = ["0"] if list(set(lst_stats)) == ["0"] else lst_stats
         stats_str = f"<- " + ' | '.join(lst_stats)# if list(set(lst_stats)) != ["0"] else ""
 
     if "attrs" in CONFIG[file].keys() and "show_total" in CONFIG[file]["attrs"]:
-        current_df = pd.read_csv(f"{data_path}/projects/{project}/{file}.csv")
-        p_hours = np.nansum(current_df["time_estimate"]) if len(current_df) > 1 else 0
+        current = get_stats(project, file)
+        p_hours = current["total"] if current["n"] > 1 else 0
         hour_str = "T: " + str(round(p_hours, 2)) + "hrs" if p_hours > 0 else ""
 
     return stats_str, hour_str
 
 
+def is_missing(value) -> bool:
+    """pd.isna for a single cell, without importing pandas (the streaming render path never loads it)."""
+    return value is None or (isinstance(value, float) and value != value)
+
+
 def process_rowlines(idx, row, width, file):
+    from termcolor import colored
 
     if "stat" in CONFIG[file].keys() and "datetime" in CONFIG[file]["stat"]:
         linelen = width - 23
@@ -243,7 +472,7 @@ def process_rowlines(idx, row, width, file):
     lines = [colored(l, "red", attrs=["bold"]) if row["flagged"] else l for l in lines]
     if row["flagged"]:
         linelen -= 13
-    if "stat" not in CONFIG[file].keys() or pd.isna(row[CONFIG[file]["stat"]]):
+    if "stat" not in CONFIG[file].keys() or is_missing(row[CONFIG[file]["stat"]]):
         lines_p.append(f"{halftab}{idx: <{5}}{lines[0]: <{linelen}}")
     else:
         stat = CONFIG[file]["stat"]
@@ -263,28 +492,87 @@ def process_date_str(date_str: str) -> str:
 
 
 def parse_description(df_row: pd.DataFrame) -> list:
-    return [""] + parse_row(f"{df_row['description']}", linelen=50) + [""]
+    return [""] + parse_row(f"{df_row['description']}", linelen=50) + ["", f"id: {df_row['id']}"]
+
+
+def is_id(pos) -> bool:
+    """Entry IDs start with a letter, so they never look like positions."""
+    return isinstance(pos, str) and pos[:1].isalpha() and pos not in ["HEAD", "TAIL"]
+
+
+def valid_pos(pos) -> bool:
+    return pos in [None, "HEAD", "TAIL"] or (isinstance(pos, str) and pos.isdigit()) or is_id(pos)
 
 
 def define_idx(pos: int, ref_obj) -> int:
+    """Position for 'HEAD', 'TAIL', an integer or (when 'ref_obj' is a list's DataFrame) an entry ID. Unknown IDs
+    give None, which callers' 'not in df.index' checks reject."""
     if pos == "HEAD":
         return 0
     elif pos == "TAIL":
         return len(ref_obj) - 1
+    elif is_id(pos) and hasattr(ref_obj, "columns"):
+        hits = (ref_obj["id"] == pos).to_numpy().nonzero()[0] if "id" in ref_obj.columns else []
+        return ref_obj.index[hits[0]] if len(hits) else None
     else:
         return int(pos)
 
 
+def define_store_idx(pos, store, project: str, file: str, extra=0) -> int:
+    """define_idx against a stored list without reading it: IDs are looked up by the store, positions checked
+    against its length (plus 'extra', e.g. 1 for an insert position)."""
+    if is_id(pos):
+        idx = store.locate(project, file, pos)
+        if idx is None:
+            from .ids import where
+
+            found = where(pos)
+            hint = f" It is in project '{found[0]}' list '{found[1]}'." if found and found != (project, file) else ""
+            raise ValueError(
+                reformat(f"ID '{pos}' not found in project '{project}' file {file}.{hint}", input_type="error")
+            )
+        return idx
+    n = store.count(project, file) + extra
+    idx = define_idx(pos, range(n))
+    if not 0 <= idx < n:
+        raise ValueError(reformat(f"Provided index not found in project '{project}' file {file}.", input_type="error"))
+    return idx
+
+
+def relocate(store, project: str, file: str, ids: list) -> list:
+    """Current positions of the entries 'ids', for a change confirmed at a prompt after the list was read. Call under
+    project_lock: another process may have moved or removed rows meanwhile, and positions from the earlier read
+    would then point at different entries."""
+    positions = [store.locate(project, file, entry_id) for entry_id in ids]
+    if None in positions:
+        raise ValueError(
+            reformat(
+                f"Entry {ids[positions.index(None)]} left project '{project}' file {file} while waiting for input. "
+                "Nothing was changed.",
+                input_type="error",
+            )
+        )
+    return positions
+
+
 def move(df: pd.DataFrame, from_index: int, to_index: int) -> pd.DataFrame:
-    """Move DF row from_index to_index."""
-    idx = list(df.index)
-    idx.remove(idx[from_index])
-    to_index = to_index if to_index != -1 else len(idx)
-    idx.insert(to_index, from_index)
-    return df.iloc[idx].reset_index(drop=True)
+    """Move DF row from_index to_index (either -1: the last row). Positions are not range-checked here; callers
+    resolve them with define_idx / define_store_idx."""
+    import numpy as np
+
+    n = len(df)
+    from_index = n - 1 if from_index == -1 else from_index
+    to_index = n - 1 if to_index == -1 else min(to_index, n - 1)
+    if from_index == to_index:
+        return df.reset_index(drop=True)
+    order = np.insert(np.delete(np.arange(n), from_index), to_index, from_index)
+    return df.take(order).reset_index(drop=True)
 
 
 def reformat_date(date_and_time: str):
+    from dateutil.relativedelta import relativedelta
+    from parse import parse
+
     date_and_time = date_and_time.strip()
     if date_and_time[-1] in ["a", "A", "p", "P"]:
         date_and_time += "m"
@@ -330,30 +618,11 @@ def reformat_date(date_and_time: str):
 
 
 def define_chain(file: str) -> list:
-    def fill_prev(file, chain):
-        prev = get_prev(file)
-        if prev:
-            chain = [get_prev(file)] + chain
-            return fill_prev(chain[0], chain)
-
-        return chain
-
-    def fill_next(file, chain):
-        chain += [file]
-        if "pull_to" in CONFIG[file].keys():
-            return fill_next(CONFIG[file]["pull_to"], chain)
-
-        return chain
-
-    nxt = fill_next(file, [])
-    prev = fill_prev(file, [])
-
-    return prev + nxt
+    """Every file whose entries can be pulled through 'file', in pull order (see graph.compile_graph)."""
+    return list(graph()["chains"][file])
 
 
 def get_prev(file):
-    senders = [f for f in CONFIG.keys() if "pull_to" in CONFIG[f].keys() and CONFIG[f]["pull_to"] == file]
-    if len(senders) > 1:
-        warnings.warn(f"Multiple files send to the provided file. Using the first in config.json: {senders[0]}.")
-    if len(senders) > 0:
-        return senders[0]
+    """The first file (in config.json order) that pulls into 'file', or None. graph()["senders"] lists them all."""
+    senders = graph()["senders"][file]
+    return senders[0] if senders else None
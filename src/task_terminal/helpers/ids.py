@@ -0,0 +1,94 @@
+# base imports
+from __future__ import annotations
+
+import string
+import threading
+
+from .helpers import data_path, file_options
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pandas as pd
+
+ids_path = f"{data_path}/ids.db"
+id_length = 5
+_local = threading.local()
+
+
+def connect():
+    """Open the ID index: entry ID -> (project, file), one B-tree lookup per ID whatever the list sizes. It does not
+    record positions: finding an entry within its list is Store.locate's job. Each thread gets its own connection,
+    since lists are read (and old ones given IDs) in a thread pool."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        import sqlite3
+
+        conn = _local.conn = sqlite3.connect(ids_path, timeout=30)
+        conn.execute("CREATE TABLE IF NOT EXISTS ids (id TEXT PRIMARY KEY, project TEXT NOT NULL, file TEXT NOT NULL)")
+    return conn
+
+
+def new_ids(n: int) -> list:
+    """'n' short random IDs, unique among themselves and the index. IDs start with a letter so they are never read
+    as positions, and never equal a list name ('move' takes either)."""
+    import secrets
+
+    conn = connect()
+    ids = {}
+    while len(ids) < n:
+        entry_id = secrets.choice(string.ascii_lowercase) + "".join(
+            secrets.choice(string.ascii_lowercase + string.digits) for _ in range(id_length - 1)
+        )
+        if entry_id in ids or entry_id in file_options:
+            continue
+        if conn.execute("SELECT 1 FROM ids WHERE id = ?", (entry_id,)).fetchone() is None:
+            ids[entry_id] = None
+    return list(ids)
+
+
+def new_id() -> str:
+    return new_ids(1)[0]
+
+
+def assign_ids(df: pd.DataFrame) -> pd.DataFrame:
+    """Give every row without an ID a new one (lists written before entries had IDs)."""
+    df = df.copy()
+    if "id" not in df.columns:
+        df["id"] = None
+    missing = df["id"].isna()
+    df["id"] = df["id"].astype(object)
+    df.loc[missing, "id"] = new_ids(int(missing.sum()))
+    return df
+
+
+def where(entry_id: str):
+    """(project, file) last recorded for 'entry_id', or None. Callers verify against the list itself: an entry moved
+    by rewriting both lists stays recorded under the list it moved to, which is correct, but that is all the index
+    promises."""
+    row = connect().execute("SELECT project, file FROM ids WHERE id = ?", (entry_id,)).fetchone()
+    return tuple(row) if row else None
+
+
+def index_ids(store, project: str, file: str, op: dict) -> None:
+    """Store hook: record where inserted or written entries now live."""
+    if op["op"] == "insert":
+        ids = [op["row"].get("id")]
+    elif op["op"] == "append":
+        ids = [row.get("id") for row in op["rows"]]
+    elif op["op"] == "write" and "id" in op["df"].columns:
+        ids = op["df"]["id"].tolist()
+    elif op["op"] == "delete":
+        with connect() as conn:
+            conn.executemany("DELETE FROM ids WHERE id = ?", [(i,) for i in op["ids"] if isinstance(i, str)])
+        return
+    elif op["op"] == "remove":
+        with connect() as conn:
+            conn.execute("DELETE FROM ids WHERE project = ?", (project,))
+        return
+    else:
+        return
+    with connect() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO ids VALUES (?, ?, ?)",
+            [(entry_id, project, file) for entry_id in ids if isinstance(entry_id, str)],
+        )
@@ -0,0 +1,68 @@
+# base imports
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from .helpers import data_path
+
+try:
+    import fcntl
+except ImportError:  # no advisory locks on this platform; writes are still atomic
+    fcntl = None
+
+_guard = threading.Lock()
+_locks = {}
+
+
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive advisory lock on 'path'. Re-entrant within a process, so nested callers do not deadlock."""
+    with _guard:
+        entry = _locks.setdefault(path, {"rlock": threading.RLock(), "fd": None, "depth": 0})
+    with entry["rlock"]:
+        if entry["depth"] == 0:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            entry["fd"] = fd
+        entry["depth"] += 1
+        try:
+            yield
+        finally:
+            entry["depth"] -= 1
+            if entry["depth"] == 0:
+                if fcntl:
+                    fcntl.flock(entry["fd"], fcntl.LOCK_UN)
+                os.close(entry["fd"])
+                entry["fd"] = None
+
+
+def project_lock(project: str):
+    """Lock one project's lists. Commands on different projects never wait on each other."""
+    return file_lock(f"{data_path}/projects/{project}/.lock")
+
+
+def registry_lock():
+    """Lock project_list.json and hidden_project_list.json."""
+    return file_lock(f"{data_path}/.registry.lock")
+
+
+def atomic_write(path: str, text) -> None:
+    """Replace 'path' via a temporary file and rename, so readers see the old or the new file, never a partial one.
+    'text' may be str or bytes."""
+    import tempfile
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.")
+    try:
+        with os.fdopen(fd, "wb" if isinstance(text, bytes) else "w") as f:
+            f.write(text)
+        os.chmod(tmp, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def write_json(path: str, obj) -> None:
+    atomic_write(path, json.dumps(obj))
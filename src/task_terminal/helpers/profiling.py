@@ -0,0 +1,102 @@
+# base imports
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Phase-level profiling for every command, enabled with '-profile' on any command line or the TASK_TERMINAL_PROFILE
+# environment variable. Each phase records wall time and the change in allocated memory blocks; phases nest, so a
+# read inside check_scheduled counts towards both. On exit the breakdown is printed to stderr, or appended as one
+# JSON line to the file named by TASK_TERMINAL_PROFILE (any value other than '1').
+profile_env = "TASK_TERMINAL_PROFILE"
+started = time.perf_counter()
+
+# the flag is taken off the command line here, before any command's argparse sees it
+if "-profile" in sys.argv[1:]:
+    sys.argv.remove("-profile")
+    os.environ.setdefault(profile_env, "1")
+enabled = bool(os.environ.get(profile_env))
+
+_command = None
+_phases = {}
+_depth = 0
+_outermost = 0.0  # time inside top-level phases, so the rest of the command can be reported as 'unattributed'
+
+
+def begin(command: str) -> None:
+    """Mark the start of a command: the time since the first task_terminal import is recorded as 'import'."""
+    global _command
+    if not enabled or _command is not None:
+        return
+    _command = command
+    record("import", time.perf_counter() - started, 0)
+    atexit.register(report)
+
+
+def record(name: str, seconds: float, blocks: int) -> None:
+    totals = _phases.setdefault(name, {"calls": 0, "seconds": 0.0, "blocks": 0})
+    totals["calls"] += 1
+    totals["seconds"] += seconds
+    totals["blocks"] += blocks
+
+
+@contextmanager
+def phase(name: str):
+    global _depth, _outermost
+    if not enabled:
+        yield
+        return
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    _depth += 1
+    try:
+        yield
+    finally:
+        _depth -= 1
+        seconds = time.perf_counter() - start
+        if _depth == 0:
+            _outermost += seconds
+        record(name, seconds, sys.getallocatedblocks() - blocks)
+
+
+def profiled(name: str):
+    """Decorator: time every call of the function as phase 'name'."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def report() -> None:
+    total = time.perf_counter() - started
+    record("unattributed", total - _phases["import"]["seconds"] - _outermost, 0)
+    result = {
+        "command": _command,
+        "argv": sys.argv[1:],
+        "time": datetime.now().isoformat(),
+        "total": round(total, 6),
+        "phases": {k: {**v, "seconds": round(v["seconds"], 6)} for k, v in _phases.items()},
+    }
+    target = os.environ.get(profile_env)
+    if target and target != "1":
+        with open(os.path.expanduser(target), "a") as f:
+            f.write(json.dumps(result) + "\n")
+        return
+    print(f"\nprofile: {_command} {result['total'] * 1000:.1f} ms", file=sys.stderr)
+    for name, totals in sorted(_phases.items(), key=lambda item: -item[1]["seconds"]):
+        print(
+            f"    {name: <18}{totals['seconds'] * 1000: >10.1f} ms{totals['calls']: >6}x{totals['blocks']: >+12} blocks",
+            file=sys.stderr,
+        )
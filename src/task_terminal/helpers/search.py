@@ -0,0 +1,137 @@
+# base imports
+from __future__ import annotations
+
+import os
+import re
+
+from .helpers import CONFIG, data_path
+
+search_path = f"{data_path}/search.db"
+_conn = None
+
+
+def exists() -> bool:
+    return os.path.isfile(search_path)
+
+
+def connect():
+    """Open the inverted index: 'docs' holds each entry's searchable text, 'postings' one row per (term, entry)."""
+    global _conn
+    if _conn is None:
+        import sqlite3
+
+        _conn = sqlite3.connect(search_path, timeout=30)
+        _conn.executescript("""
+            CREATE TABLE IF NOT EXISTS docs (
+                id TEXT PRIMARY KEY,
+                project TEXT NOT NULL,
+                file TEXT NOT NULL,
+                entry TEXT,
+                description TEXT
+            );
+            CREATE INDEX IF NOT EXISTS docs_list ON docs (project, file);
+            CREATE TABLE IF NOT EXISTS postings (term TEXT NOT NULL, id TEXT NOT NULL, PRIMARY KEY (term, id))
+                WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_id ON postings (id);
+            """)
+    return _conn
+
+
+def tokenize(*texts) -> set:
+    return {t for text in texts if isinstance(text, str) for t in re.findall(r"[a-z0-9]+", text.lower())}
+
+
+def put_docs(conn, project: str, file: str, rows: list) -> None:
+    """(Re)index entries given as dicts with 'id', 'entry' and 'description'."""
+    rows = [r for r in rows if isinstance(r.get("id"), str)]
+    drop_docs(conn, [r["id"] for r in rows])
+    conn.executemany(
+        "INSERT INTO docs VALUES (?, ?, ?, ?, ?)",
+        [(r["id"], project, file, text(r.get("entry")), text(r.get("description"))) for r in rows],
+    )
+    conn.executemany(
+        "INSERT INTO postings VALUES (?, ?)",
+        [(term, r["id"]) for r in rows for term in tokenize(r.get("entry"), r.get("description"))],
+    )
+
+
+def drop_docs(conn, ids: list) -> None:
+    conn.executemany("DELETE FROM postings WHERE id = ?", [(i,) for i in ids])
+    conn.executemany("DELETE FROM docs WHERE id = ?", [(i,) for i in ids])
+
+
+def text(value):
+    return value if isinstance(value, str) else None
+
+
+def sync_list(conn, project: str, file: str, rows: list) -> None:
+    """Make the index match a whole list, re-tokenizing only entries that are new or whose text changed."""
+    indexed = {
+        i: (e, d)
+        for i, e, d in conn.execute(
+            "SELECT id, entry, description FROM docs WHERE project = ? AND file = ?", (project, file)
+        )
+    }
+    current = {r["id"] for r in rows if isinstance(r.get("id"), str)}
+    drop_docs(conn, [i for i in indexed if i not in current])
+    put_docs(
+        conn,
+        project,
+        file,
+        [r for r in rows if indexed.get(r.get("id")) != (text(r.get("entry")), text(r.get("description")))],
+    )
+
+
+def index_text(store, project: str, file: str, op: dict) -> None:
+    """Store hook: keep the search index current. Does nothing until the index has been built (see rebuild)."""
+    if not exists():
+        return
+    with connect() as conn:
+        if op["op"] == "insert":
+            put_docs(conn, project, file, [op["row"]])
+        elif op["op"] == "append":
+            put_docs(conn, project, file, op["rows"])
+        elif op["op"] == "update" and {"entry", "description"} & set(op["values"]):
+            row = conn.execute("SELECT entry, description FROM docs WHERE id = ?", (op["id"],)).fetchone()
+            doc = {"id": op["id"], "entry": row[0] if row else None, "description": row[1] if row else None}
+            put_docs(conn, project, file, [{**doc, **op["values"]}])
+        elif op["op"] == "delete":
+            drop_docs(conn, op["ids"])
+        elif op["op"] == "write":
+            sync_list(conn, project, file, op["df"].to_dict("records"))
+        elif op["op"] == "remove":
+            ids = [i for (i,) in conn.execute("SELECT id FROM docs WHERE project = ?", (project,))]
+            drop_docs(conn, ids)
+
+
+def rebuild(store, projects: list) -> int:
+    """Index every list of 'projects' (the caller passes active and hidden). Returns the number of entries indexed."""
+    with connect() as conn:
+        conn.execute("DELETE FROM postings")
+        conn.execute("DELETE FROM docs")
+        for project in projects:
+            for file in CONFIG.keys():
+                # read rather than iter_rows: reading through the store gives older lists their IDs
+                put_docs(conn, project, file, store.read(project, file).to_dict("records"))
+    return connect().execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+
+def search(query: str, projects: list, files: list, limit: int = None) -> list:
+    """Entries containing every term of 'query' (each as a word prefix) in their entry or description text."""
+    terms = sorted(tokenize(query))
+    if not terms:
+        return []
+    # one indexed range scan per term, intersected inside SQLite
+    ranges = " INTERSECT ".join(["SELECT id FROM postings WHERE term >= ? AND term < ?"] * len(terms))
+    params = [bound for term in terms for bound in (term, term[:-1] + chr(ord(term[-1]) + 1))]
+    query = (
+        f"SELECT id, project, file, entry, description FROM docs WHERE id IN ({ranges}) "
+        f"AND project IN ({', '.join('?' * len(projects))}) AND file IN ({', '.join('?' * len(files))}) "
+        "ORDER BY project, file"
+    )
+    params += projects + files
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    keys = ["id", "project", "file", "entry", "description"]
+    return [dict(zip(keys, row)) for row in connect().execute(query, params)]
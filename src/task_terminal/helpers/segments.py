@@ -0,0 +1,138 @@
+# base imports
+from __future__ import annotations
+
+import csv
+import io
+import os
+from datetime import datetime
+
+from .helpers import CONFIG, data_path, date_format, load_json
+from .locks import atomic_write, write_json
+from .stats import list_stats
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def segment_column(file: str):
+    """Date column a list is segmented by ('segment_by' in config.json), or None for lists kept in one file."""
+    return CONFIG[file].get("segment_by")
+
+
+def segment_dir(project: str, file: str) -> str:
+    return f"{data_path}/projects/{project}/{file}"
+
+
+def segment_path(project: str, file: str, month: str) -> str:
+    return f"{segment_dir(project, file)}/{month}.csv.gz"
+
+
+def manifest_path(project: str, file: str) -> str:
+    return f"{segment_dir(project, file)}/segments.json"
+
+
+def load_manifest(project: str, file: str) -> dict:
+    """{month: {"n", "digest", "stats"}} for the list's sealed segments, oldest first."""
+    path = manifest_path(project, file)
+    manifest = load_json(path) if os.path.isfile(path) else {}
+    return dict(sorted(manifest.items()))
+
+
+def sealed_count(project: str, file: str) -> int:
+    return sum(segment["n"] for segment in load_manifest(project, file).values())
+
+
+def current_month() -> str:
+    return datetime.now().strftime("%Y-%m")
+
+
+def month_key(value):
+    """'YYYY-MM' of a date_format string, or None."""
+    return f"{value[6:10]}-{value[:2]}" if isinstance(value, str) and len(value) >= 10 else None
+
+
+def arrival(row: dict, column: str = "datetime_moved"):
+    """When an entry arrived in its list: 'column' if set, else when it was created. None if neither is set."""
+    value = row.get(column) if isinstance(row.get(column), str) else row.get("datetime_created")
+    return datetime.strptime(value, date_format) if isinstance(value, str) else None
+
+
+def row_months(df: pd.DataFrame, column: str) -> list:
+    moved, created = df[column].tolist(), df["datetime_created"].tolist()
+    return [month_key(m) or month_key(c) for m, c in zip(moved, created)]
+
+
+def read_segment(project: str, file: str, month: str) -> pd.DataFrame:
+    import pandas as pd
+
+    return pd.read_csv(segment_path(project, file, month), compression="gzip")
+
+
+def iter_segment(project: str, file: str, month: str):
+    """csv.DictReader records of one sealed segment, decompressed as they are read."""
+    import gzip
+
+    with gzip.open(segment_path(project, file, month), "rt", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def digest(df: pd.DataFrame) -> str:
+    """Order-sensitive hash of a segment's rows, so unchanged segments are not recompressed on every write."""
+    import hashlib
+
+    import pandas as pd
+
+    return hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def put_segment(project: str, file: str, month: str, df: pd.DataFrame, manifest: dict) -> None:
+    """Write one sealed segment (gzip-compressed CSV) and record it in 'manifest', unless it is unchanged."""
+    import gzip
+
+    df = df.reset_index(drop=True)
+    token = digest(df)
+    if manifest.get(month, {}).get("digest") == token:
+        return
+    os.makedirs(segment_dir(project, file), exist_ok=True)
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as f:
+        f.write(df.to_csv(index=False).encode())
+    atomic_write(segment_path(project, file, month), buffer.getvalue())
+    manifest[month] = {"n": len(df), "digest": token, "stats": list_stats(df)}
+
+
+def split(project: str, file: str, df: pd.DataFrame, partial: bool) -> pd.DataFrame:
+    """Seal the rows of 'df' that arrived before the current month into their monthly segments and return the rest,
+    which stay in the list's plain CSV. With 'partial', 'df' holds only those current rows (a row-level change) and
+    any rows it seals are appended to their segments; otherwise 'df' is the whole list and the segments are made to
+    match it. Segments are kept in month order, so a full list is read back oldest month first."""
+    column = segment_column(file)
+    months = row_months(df, column)
+    now = current_month()
+    manifest = load_manifest(project, file)
+    before = dict(manifest)
+    sealed = {}
+    for i, month in enumerate(months):
+        if month is not None and month < now:
+            sealed.setdefault(month, []).append(i)
+    if partial and not sealed:
+        return df
+
+    import pandas as pd
+
+    for month, rows in sealed.items():
+        chunk = df.iloc[rows]
+        if partial and month in manifest:
+            chunk = pd.concat([read_segment(project, file, month), chunk], ignore_index=True)
+        put_segment(project, file, month, chunk, manifest)
+    if not partial:
+        for month in [m for m in manifest if m not in sealed]:
+            os.remove(segment_path(project, file, month))
+            del manifest[month]
+    # segments and manifest go first: a crash before the plain CSV is rewritten can repeat rows, never lose them
+    if manifest != before:
+        write_json(manifest_path(project, file), manifest)
+
+    current = [i for i, month in enumerate(months) if month is None or month >= now]
+    return df.iloc[current].reset_index(drop=True)
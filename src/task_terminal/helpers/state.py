@@ -0,0 +1,74 @@
+# base imports
+import json
+
+from .completion import save_names
+from .graph import config
+from .helpers import data_path, load_json, pkg_path
+from .locks import write_json
+
+
+class Session:
+    """Application state shared by every command in a process: the project registry (active and hidden projects),
+    config.json and templates.json, each loaded on first use and then kept.
+
+    Commands change the registry through save_registry, which updates this copy too, so a follow-up 'lst' redraw in
+    the same process shows the change without reloading. Reads under registry_lock pass fresh=True so another
+    process's change is never overwritten. The daemon calls reset() before each request.
+    """
+
+    def __init__(self):
+        self._registry = None
+        self._templates = None
+
+    def reset(self) -> None:
+        """Forget the registry so the next access reloads it (templates and config do not change at runtime)."""
+        self._registry = None
+
+    def registry(self, fresh: bool = False) -> dict:
+        """{"active": [...], "hidden": [...]}, as copies the caller may change before passing to save_registry."""
+        if fresh or self._registry is None:
+            self._registry = {
+                "active": load_json(f"{data_path}/project_list.json"),
+                "hidden": load_json(f"{data_path}/hidden_project_list.json"),
+            }
+        return {k: list(v) for k, v in self._registry.items()}
+
+    def save_registry(self, active: list = None, hidden: list = None) -> None:
+        """Write whichever of the two lists are given, and their shell completion names. Callers hold registry_lock."""
+        registry = self.registry()
+        if active is not None:
+            write_json(f"{data_path}/project_list.json", active)
+            save_names("projects", active)
+            registry["active"] = list(active)
+        if hidden is not None:
+            write_json(f"{data_path}/hidden_project_list.json", hidden)
+            save_names("hidden", hidden)
+            registry["hidden"] = list(hidden)
+        self._registry = registry
+
+    @property
+    def projects(self) -> list:
+        return self.registry()["active"]
+
+    @property
+    def hidden(self) -> list:
+        return self.registry()["hidden"]
+
+    @property
+    def visible(self) -> list:
+        """Active projects that are not hidden, in registry order."""
+        hidden = self.hidden
+        return [p for p in self.projects if p not in hidden]
+
+    @property
+    def config(self) -> dict:
+        return config()
+
+    @property
+    def templates(self) -> dict:
+        if self._templates is None:
+            self._templates = json.load(open(f"{pkg_path}/helpers/templates.json"))
+        return self._templates
+
+
+session = Session()
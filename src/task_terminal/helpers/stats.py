@@ -0,0 +1,111 @@
+# base imports
+from __future__ import annotations
+
+import os
+from datetime import datetime
+
+from . import columnar
+from .helpers import CONFIG, data_path, date_format, load_json
+from .locks import project_lock, write_json
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pandas as pd
+
+# columns whose edits can change a list's stats
+stat_columns = {"time_estimate", "flagged", "datetime_scheduled"}
+
+
+def stats_path(project: str) -> str:
+    return f"{data_path}/projects/{project}/stats.json"
+
+
+def empty_stats() -> dict:
+    return {"n": 0, "total": 0, "flagged": 0, "next_scheduled": None}
+
+
+def list_stats(df: pd.DataFrame) -> dict:
+    """Row count, total hours, flagged count and earliest scheduled time (ISO) of one list."""
+    import numpy as np
+    import pandas as pd
+
+    scheduled = pd.to_datetime(df["datetime_scheduled"], format=date_format, errors="coerce").dropna()
+    return {
+        "n": len(df),
+        "total": round(float(np.nansum(pd.to_numeric(df["time_estimate"], errors="coerce"))), 2),
+        "flagged": int(df["flagged"].eq(True).sum()),
+        "next_scheduled": scheduled.min().isoformat() if len(scheduled) else None,
+    }
+
+
+def add_row(stats: dict, row: dict) -> dict:
+    """Stats after appending 'row', without re-reading the list."""
+    stats = dict(stats)
+    stats["n"] += 1
+    hours = row.get("time_estimate")
+    if hours is not None and hours == hours:
+        stats["total"] = round(stats["total"] + float(hours), 2)
+    stats["flagged"] += bool(row.get("flagged"))
+    if isinstance(row.get("datetime_scheduled"), str):
+        scheduled = datetime.strptime(row["datetime_scheduled"], date_format).isoformat()
+        stats["next_scheduled"] = min(filter(None, [stats["next_scheduled"], scheduled]))
+    return stats
+
+
+def merge_stats(parts: list) -> dict:
+    """Stats of a list stored in parts (e.g. archive segments) from the stats of each part."""
+    scheduled = [p["next_scheduled"] for p in parts if p["next_scheduled"]]
+    return {
+        "n": sum(p["n"] for p in parts),
+        "total": round(sum(p["total"] for p in parts), 2),
+        "flagged": sum(p["flagged"] for p in parts),
+        "next_scheduled": min(scheduled) if scheduled else None,
+    }
+
+
+def recompute(store, project: str, file: str) -> dict:
+    """One list's stats from its columnar sidecar where enabled (no text is parsed), else from the store."""
+    arrays = columnar.load(store, project, file)
+    return columnar.stats(arrays) if arrays is not None else store.stats(project, file)
+
+
+def load_stats(project: str) -> dict:
+    path = stats_path(project)
+    return load_json(path) if os.path.isfile(path) else {}
+
+
+def update_stats(store, project: str, file: str, op: dict) -> None:
+    """Store hook: keep '{project}/stats.json' current after each change (see HookedStore)."""
+    if op["op"] == "remove":
+        return
+    if op["op"] == "create":
+        write_json(stats_path(project), {f: empty_stats() for f in CONFIG.keys()})
+        return
+    if op["op"] == "reorder" or (op["op"] == "update" and not stat_columns & set(op["values"])):
+        return
+
+    with project_lock(project):
+        manifest = load_stats(project)
+        if op["op"] == "write":
+            manifest[file] = list_stats(op["df"])
+        elif op["op"] == "insert" and file in manifest:
+            manifest[file] = add_row(manifest[file], op["row"])
+        elif op["op"] == "append" and file in manifest:
+            for row in op["rows"]:
+                manifest[file] = add_row(manifest[file], row)
+        else:
+            manifest[file] = recompute(store, project, file)
+        write_json(stats_path(project), manifest)
+
+
+def get_stats(project: str, file: str) -> dict:
+    """Stats for one list from the manifest, built from the list itself the first time (e.g. for older data)."""
+    manifest = load_stats(project)
+    if file not in manifest:
+        from .store import get_store
+
+        with project_lock(project):
+            manifest = load_stats(project)
+            manifest[file] = recompute(get_store(), project, file)
+            write_json(stats_path(project), manifest)
+    return manifest[file]
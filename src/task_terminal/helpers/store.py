@@ -0,0 +1,1040 @@
+# base imports
+from __future__ import annotations
+
+import csv
+import json
+import os
+import warnings
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from itertools import islice
+
+from .columnar import update_columns
+from .completion import update_lengths
+from .helpers import CONFIG, CONFIG_FULL, clear_render_cache, columns, data_path, date_format, move, transfer_rows
+from .ids import assign_ids, index_ids
+from .locks import atomic_write, project_lock, write_json
+from .profiling import profiled
+from .search import index_text
+from .segments import (
+    arrival,
+    iter_segment,
+    load_manifest,
+    manifest_path,
+    read_segment,
+    sealed_count,
+    segment_column,
+    split,
+)
+from .stats import list_stats, merge_stats, update_stats
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pandas as pd
+
+read_workers = 8
+rank_gap = 1e-9  # closest two neighbouring SQLite rank keys may get before the list is respaced
+
+
+class Store:
+    """Storage interface shared by every command. Positions are zero-indexed and follow list order.
+
+    Backends must implement read, write, create_project and remove_project. The row-level methods are expressed as
+    ops (see apply_op) and by default fall back to a read-modify-write of the full list; backends that can do better
+    override 'apply' or the individual methods.
+    """
+
+    name = None
+    concurrent_reads = True
+
+    def read(self, project: str, file: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def write(self, project: str, file: str, df: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def create_project(self, project: str) -> None:
+        raise NotImplementedError
+
+    def remove_project(self, project: str) -> None:
+        raise NotImplementedError
+
+    def count(self, project: str, file: str) -> int:
+        return len(self.read(project, file))
+
+    def locate(self, project: str, file: str, entry_id: str):
+        """Position of the entry with 'entry_id' in the list, or None. O(n): the list is read and scanned, since ids.db
+        records only each ID's project and list, not its position (which every insert or delete above it shifts).
+        SQLiteStore answers from its (project, file, id) index instead."""
+        df = self.read(project, file)
+        hits = (df["id"] == entry_id).to_numpy().nonzero()[0] if "id" in df.columns else []
+        return int(hits[0]) if len(hits) else None
+
+    def ids_at(self, project: str, file: str, positions: list) -> list:
+        """Entry IDs at 'positions', in the order given."""
+        wanted = set(positions)
+        found = {pos: row.get("id") for pos, row in self.iter_rows(project, file, 0, max(wanted) + 1) if pos in wanted}
+        return [found.get(pos) for pos in positions]
+
+    def iter_rows(self, project: str, file: str, start: int = 0, stop: int = None):
+        """Yield (position, row dict) for positions start..stop-1 in list order. Backends that can, stream them."""
+        df = self.read(project, file)
+        yield from enumerate(df.iloc[start:stop].to_dict("records"), start=start)
+
+    def iter_since(self, project: str, file: str, since: datetime):
+        """Yield (position, row dict) for entries that arrived in the list at or after 'since' (see
+        segments.arrival)."""
+        column = segment_column(file) or "datetime_moved"
+        for pos, row in self.iter_rows(project, file, self.first_since(project, file, since)):
+            arrived = arrival(row, column)
+            if arrived is not None and arrived >= since:
+                yield pos, row
+
+    def first_since(self, project: str, file: str, since: datetime) -> int:
+        """Position before which no entry arrived at or after 'since'. Backends that partition lists by date skip
+        whole partitions; otherwise 0."""
+        return 0
+
+    def read_many(self, pairs: list) -> dict:
+        """Read each (project, file) once, on a bounded thread pool where the backend allows. Returns {pair: df}."""
+        pairs = list(dict.fromkeys(pairs))
+        if not self.concurrent_reads or len(pairs) < 2:
+            return {pair: self.read(*pair) for pair in pairs}
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(read_workers, len(pairs))) as pool:
+            return dict(zip(pairs, pool.map(lambda pair: self.read(*pair), pairs)))
+
+    def version(self, project: str, file: str):
+        """Token that changes whenever the list changes, or None if the backend cannot tell."""
+        return None
+
+    def stats(self, project: str, file: str) -> dict:
+        """Recompute one list's stats (see helpers/stats.py) from its contents."""
+        return list_stats(self.read(project, file))
+
+    @contextmanager
+    def transaction(self):
+        """Group writes so they are committed together where the backend supports it."""
+        yield
+
+    def apply(self, project: str, file: str, op: dict) -> None:
+        self.write(project, file, apply_op(self.read(project, file), op))
+
+    def insert(self, project: str, file: str, row: dict, pos: int) -> None:
+        self.apply(project, file, {"op": "insert", "row": row, "pos": pos})
+
+    def update(self, project: str, file: str, pos: int, values: dict) -> None:
+        self.apply(project, file, {"op": "update", "pos": pos, "values": values})
+
+    def delete(self, project: str, file: str, positions: list) -> None:
+        self.apply(project, file, {"op": "delete", "positions": list(positions)})
+
+    def append(self, project: str, file: str, rows: list) -> None:
+        """Add 'rows' to the end of the list as one op."""
+        self.apply(project, file, {"op": "append", "rows": list(rows)})
+
+    def reorder(self, project: str, file: str, from_index: int, to_index: int) -> None:
+        self.apply(project, file, {"op": "reorder", "from": from_index, "to": to_index})
+
+    def appends_rows(self, file: str) -> bool:
+        """True if appending rows to 'file' costs less than rewriting it, so transfers append instead."""
+        return False
+
+    def transfer(self, project: str, from_file: str, to_file: str, positions: list, values: dict = None):
+        """Move the entries at 'positions' to the end of 'to_file' (see transfer_rows), reading and writing each list
+        at most once; where the backend appends rows cheaply, 'to_file' is not read at all. Returns the moved rows as
+        they now are in 'to_file'."""
+        with self.transaction():
+            from_df = self.read(project, from_file)
+            if self.appends_rows(to_file):
+                # one row-level op per list, so neither is rewritten as a whole (nor a journal compacted). The delete
+                # goes first: hooks drop deleted entries from the ID and search indexes by ID, and the append then
+                # records the same IDs under 'to_file'.
+                _, _, moved = transfer_rows(positions, from_df, from_df.iloc[:0], values=values)
+                self.delete(project, from_file, positions)
+                self.append(project, to_file, moved.to_dict("records"))
+            else:
+                from_df, to_df, moved = transfer_rows(positions, from_df, self.read(project, to_file), values=values)
+                self.write(project, to_file, to_df)
+                self.write(project, from_file, from_df)
+        return moved
+
+
+class CSVStore(Store):
+    """One '{data_path}/projects/{project}/{file}.csv' per list. The original TaskTerminal layout.
+
+    Lists with 'segment_by' in config.json (archives by default) keep only entries that arrived this month in that
+    file. Older entries are sealed into gzip-compressed monthly segments under '{project}/{file}/' (see segments.py),
+    listed in 'segments.json' with their row counts and stats, so appending, counting, tailing and date-bounded
+    reads do not decompress them.
+    """
+
+    name = "csv"
+
+    def path(self, project, file):
+        return f"{data_path}/projects/{project}/{file}.csv"
+
+    def read(self, project, file):
+        import pandas as pd
+
+        df = pd.read_csv(self.path(project, file))
+        months = list(load_manifest(project, file)) if segment_column(file) else []
+        if not months:
+            return df
+        frames = [read_segment(project, file, month) for month in months] + [df]
+        return pd.concat([f for f in frames if len(f)], ignore_index=True)
+
+    def write(self, project, file, df):
+        if segment_column(file):
+            df = split(project, file, df, partial=False)
+        atomic_write(self.path(project, file), df.to_csv(index=False))
+
+    def apply(self, project, file, op):
+        # row-level changes past the sealed segments only rewrite the current month's file
+        sealed = sealed_count(project, file) if segment_column(file) else 0
+        if not sealed or any(pos < sealed for pos in op_positions(op)):
+            return super().apply(project, file, op)
+
+        import pandas as pd
+
+        df = apply_op(pd.read_csv(self.path(project, file)), shift_op(op, -sealed))
+        atomic_write(self.path(project, file), split(project, file, df, partial=True).to_csv(index=False))
+
+    def appends_rows(self, file):
+        # appending to a segmented list rewrites only the current month's file (see apply)
+        return bool(segment_column(file))
+
+    def iter_rows(self, project, file, start=0, stop=None):
+        # csv module rather than pandas so memory stays flat however long the list is
+        pos = 0
+        segments = load_manifest(project, file) if segment_column(file) else {}
+        for month, segment in segments.items():
+            if pos + segment["n"] > start and (stop is None or pos < stop):
+                records = islice(iter_segment(project, file, month), max(start - pos, 0), window_stop(stop, pos))
+                for offset, record in enumerate(records, start=max(start - pos, 0)):
+                    yield pos + offset, csv_row(record)
+            pos += segment["n"]
+        with open(self.path(project, file), "r", newline="") as f:
+            records = islice(csv.DictReader(f), max(start - pos, 0), window_stop(stop, pos))
+            for offset, record in enumerate(records, start=max(start - pos, 0)):
+                yield pos + offset, csv_row(record)
+
+    def first_since(self, project, file, since):
+        month = since.strftime("%Y-%m")
+        segments = load_manifest(project, file) if segment_column(file) else {}
+        return sum(segment["n"] for m, segment in segments.items() if m < month)
+
+    def count(self, project, file):
+        # rows of the file itself, never Store.count's read: JournalStore adds its pending ops to this
+        with open(self.path(project, file), "r", newline="") as f:
+            n = sum(1 for _ in csv.DictReader(f))
+        return n + (sealed_count(project, file) if segment_column(file) else 0)
+
+    def stats(self, project, file):
+        if not segment_column(file):
+            return super().stats(project, file)
+        import pandas as pd
+
+        sealed = [segment["stats"] for segment in load_manifest(project, file).values()]
+        return merge_stats(sealed + [list_stats(pd.read_csv(self.path(project, file)))])
+
+    def version(self, project, file):
+        stat = os.stat(self.path(project, file))
+        version = stat.st_ino, stat.st_mtime_ns, stat.st_size
+        manifest = segment_column(file) and manifest_path(project, file)
+        if manifest and os.path.isfile(manifest):
+            stat = os.stat(manifest)
+            version += (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        return version
+
+    def create_project(self, project):
+        import pandas as pd
+
+        os.makedirs(f"{data_path}/projects/{project}")
+        for file in CONFIG.keys():
+            pd.DataFrame(columns=columns).to_csv(self.path(project, file), index=False)
+
+    def remove_project(self, project):
+        from shutil import rmtree
+
+        rmtree(f"{data_path}/projects/{project}")
+
+
+class JournalStore(CSVStore):
+    """CSV base files plus an append-only per-project journal of row-level ops.
+
+    Inserts, updates, deletes, appends and reorders append one line to '{project}/journal.jsonl' instead of
+    rewriting the list, once checked against the list's length (check_op). Reads replay the journal over the base
+    file. Once the journal passes 'max_entries' lines or 'max_bytes', it is compacted: every list with pending ops is
+    rewritten once and the journal is truncated. Each op carries a sequence number and 'snapshot.json' records the
+    last one folded into each base file (see folded), so an interrupted compaction never applies an op twice.
+    """
+
+    name = "journal"
+    max_entries = 200
+    max_bytes = 256 * 1024
+
+    def appends_rows(self, file):
+        return True
+
+    def journal_path(self, project):
+        return f"{data_path}/projects/{project}/journal.jsonl"
+
+    def snapshot_path(self, project):
+        return f"{data_path}/projects/{project}/snapshot.json"
+
+    def load_journal(self, project) -> list:
+        path = self.journal_path(project)
+        if not os.path.isfile(path):
+            return []
+        with open(path, "r") as f:
+            # a torn final line from an interrupted append is ignored
+            return [json.loads(line) for line in f if line.endswith("\n")]
+
+    def load_snapshot(self, project) -> dict:
+        path = self.snapshot_path(project)
+        return json.load(open(path, "r")) if os.path.isfile(path) else {}
+
+    def base_version(self, project, file) -> list:
+        # as stored in snapshot.json
+        return json.loads(json.dumps(CSVStore.version(self, project, file)))
+
+    def folded(self, project) -> dict:
+        """{file: seq of the last op folded into its base file}. Before rewriting any base file, compact records its
+        target seqs under 'compacting' with each file's version at that point; a base file whose version has changed
+        since was rewritten by that compaction, whether or not it finished."""
+        snapshot = self.load_snapshot(project)
+        folded = {file: seq for file, seq in snapshot.items() if file != "compacting"}
+        for file, intent in snapshot.get("compacting", {}).items():
+            if self.base_version(project, file) != intent["from"]:
+                folded[file] = intent["seq"]
+        return folded
+
+    def pending(self, project, file=None) -> list:
+        folded = self.folded(project)
+        return [
+            op
+            for op in self.load_journal(project)
+            if op["seq"] > folded.get(op["file"], 0) and (file is None or op["file"] == file)
+        ]
+
+    def read(self, project, file):
+        with project_lock(project):
+            df = super().read(project, file)
+            for op in self.pending(project, file):
+                try:
+                    df = apply_op(df, op)
+                except (IndexError, KeyError, ValueError) as e:
+                    # journalled before ops were checked; skipping it keeps the list readable
+                    warnings.warn(f"Skipping journal op {op['seq']} of project '{project}' file {file}: {e!r}.")
+        return df
+
+    def write(self, project, file, df):
+        with project_lock(project):
+            self.compact(project)
+            super().write(project, file, df)
+
+    def iter_rows(self, project, file, start=0, stop=None):
+        # pending ops can move rows anywhere, so replay them over the whole list
+        return Store.iter_rows(self, project, file, start, stop)
+
+    def first_since(self, project, file, since):
+        return Store.first_since(self, project, file, since)
+
+    def count(self, project, file):
+        # pending inserts and deletes change the base file's count; nothing else does
+        with project_lock(project):
+            n = super().count(project, file)
+            for op in self.pending(project, file):
+                n += 1 if op["op"] == "insert" else -len(set(op["positions"])) if op["op"] == "delete" else 0
+                n += len(op["rows"]) if op["op"] == "append" else 0
+        return n
+
+    def stats(self, project, file):
+        return Store.stats(self, project, file)
+
+    def version(self, project, file):
+        journal = self.journal_path(project)
+        journal_size = os.path.getsize(journal) if os.path.isfile(journal) else 0
+        return super().version(project, file), journal_size
+
+    def apply(self, project, file, op):
+        with project_lock(project):
+            # an op that fails on replay would make every later read of the list fail, so it is never journalled
+            check_op(op, self.count(project, file))
+            journal = self.load_journal(project)
+            seq = max([j["seq"] for j in journal] + list(self.folded(project).values()) + [0]) + 1
+            line = json.dumps({"seq": seq, "file": file, **op}, default=json_value) + "\n"
+            with open(self.journal_path(project), "a") as f:
+                f.write(line)
+            size = os.path.getsize(self.journal_path(project))
+            if len(journal) + 1 >= self.max_entries or size >= self.max_bytes:
+                self.compact(project)
+
+    def compact(self, project) -> None:
+        """Fold pending ops into the base files (each rewritten once) and truncate the journal."""
+        with project_lock(project):
+            pending = self.pending(project)
+            if pending:
+                folded = self.folded(project)
+                frames = {file: self.read(project, file) for file in dict.fromkeys(op["file"] for op in pending)}
+                seqs = {file: max(op["seq"] for op in pending if op["file"] == file) for file in frames}
+                intent = {file: {"seq": seqs[file], "from": self.base_version(project, file)} for file in frames}
+                write_json(self.snapshot_path(project), {**folded, "compacting": intent})
+                for file, df in frames.items():
+                    CSVStore.write(self, project, file, df)
+                write_json(self.snapshot_path(project), {**folded, **seqs})
+            if os.path.isfile(self.journal_path(project)):
+                os.remove(self.journal_path(project))
+
+
+class SQLiteStore(Store):
+    """All lists in '{data_path}/tasks.db', one row per entry, ordered within each list by a fractional 'rank' key.
+
+    Row-level methods touch only the affected rows: an insert or reorder gives one row a rank between its new
+    neighbours' (see rank_between) and a delete removes rows without renumbering the rest. Positions are counted along
+    the (project, file, rank) index. When two neighbouring ranks get too close, the list's ranks are respaced once.
+    Existing CSV lists are imported the first time the database is created.
+    """
+
+    name = "sqlite"
+    in_transaction = False
+    concurrent_reads = False  # one connection, bound to the thread that opened it
+    schema = """
+        CREATE TABLE IF NOT EXISTS entries (
+            project TEXT NOT NULL,
+            file TEXT NOT NULL,
+            rank REAL NOT NULL,
+            entry TEXT,
+            description TEXT,
+            time_estimate REAL,
+            flagged INTEGER,
+            datetime_created TEXT,
+            datetime_moved TEXT,
+            datetime_scheduled TEXT,
+            id TEXT
+        );
+        CREATE TABLE IF NOT EXISTS versions (
+            project TEXT NOT NULL,
+            file TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            PRIMARY KEY (project, file)
+        );
+        """
+    indexes = """
+        CREATE INDEX IF NOT EXISTS entries_rank ON entries (project, file, rank);
+        CREATE INDEX IF NOT EXISTS entries_scheduled ON entries (file, datetime_scheduled)
+            WHERE datetime_scheduled IS NOT NULL;
+        CREATE INDEX IF NOT EXISTS entries_id ON entries (project, file, id);
+        """
+
+    def __init__(self, path=None):
+        import sqlite3
+
+        self.path = path or f"{data_path}/tasks.db"
+        is_new = not os.path.isfile(self.path)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.executescript(self.schema)
+        existing = [c[1] for c in self.conn.execute("PRAGMA table_info(entries)")]
+        if "id" not in existing:
+            # databases created before entries had IDs; HookedStore.read fills them in
+            self.conn.execute("ALTER TABLE entries ADD COLUMN id TEXT")
+        if "position" in existing:
+            self.migrate_positions()
+        self.conn.executescript(self.indexes)
+        if is_new:
+            self.import_csv()
+
+    def appends_rows(self, file):
+        return True
+
+    def migrate_positions(self):
+        """Databases created before rank keys ordered lists by a contiguous 'position'; it becomes the rank."""
+        with self.conn:
+            self.conn.execute("ALTER TABLE entries RENAME TO entries_by_position")
+            self.conn.executescript(self.schema)
+            self.conn.execute(
+                f"INSERT INTO entries (project, file, rank, {', '.join(columns)}) "
+                f"SELECT project, file, position, {', '.join(columns)} FROM entries_by_position"
+            )
+            self.conn.execute("DROP TABLE entries_by_position")
+
+    def tx(self):
+        """Commit on exit, unless inside transaction() where the outer block commits."""
+        return nullcontext() if self.in_transaction else self.conn
+
+    @contextmanager
+    def transaction(self):
+        self.in_transaction = True
+        try:
+            with self.conn:
+                yield
+        finally:
+            self.in_transaction = False
+
+    def import_csv(self):
+        csv_store = CSVStore()
+        projects_path = f"{data_path}/projects"
+        projects = os.listdir(projects_path) if os.path.isdir(projects_path) else []
+        with self.tx():
+            for project in projects:
+                for file in CONFIG.keys():
+                    if os.path.isfile(csv_store.path(project, file)):
+                        self._insert_rows(project, file, csv_store.read(project, file).to_dict("records"), 0)
+
+    def _bump(self, project, file):
+        self.conn.execute(
+            "INSERT INTO versions VALUES (?, ?, 1) ON CONFLICT (project, file) DO UPDATE SET version = version + 1",
+            (project, file),
+        )
+
+    def _insert_rows(self, project, file, rows, first_rank):
+        self.conn.executemany(
+            f"INSERT INTO entries (project, file, rank, {', '.join(columns)}) "
+            f"VALUES (?, ?, ?{', ?' * len(columns)})",
+            [[project, file, first_rank + i] + [sql_value(row.get(c)) for c in columns] for i, row in enumerate(rows)],
+        )
+
+    def _rowids(self, project, file, positions) -> dict:
+        """{position: rowid} for the entries at 'positions'."""
+        if len(positions) == 1:
+            row = self.conn.execute(
+                "SELECT rowid FROM entries WHERE project = ? AND file = ? ORDER BY rank LIMIT 1 OFFSET ?",
+                (project, file, positions[0]),
+            ).fetchone()
+            return {positions[0]: row[0]} if row else {}
+        return dict(
+            self.conn.execute(
+                "SELECT position, rowid FROM (SELECT ROW_NUMBER() OVER (ORDER BY rank) - 1 AS position, rowid "
+                f"FROM entries WHERE project = ? AND file = ?) WHERE position IN ({', '.join('?' * len(positions))})",
+                [project, file] + list(positions),
+            )
+        )
+
+    def _rank_at(self, project, file, pos, exclude=None) -> float:
+        """A rank that sorts an entry at 'pos' in the list, leaving out the entry with rowid 'exclude' (the one being
+        moved). Respaces the list's ranks first if the neighbours' ranks are too close to fit one between them."""
+        query = (
+            "SELECT rank FROM entries WHERE project = ? AND file = ? AND rowid IS NOT ? ORDER BY rank LIMIT ? OFFSET ?"
+        )
+        for _ in range(2):
+            if pos == 0:
+                lo, hi = None, self.conn.execute(query, (project, file, exclude, 1, 0)).fetchone()
+            else:
+                ranks = self.conn.execute(query, (project, file, exclude, 2, pos - 1)).fetchall()
+                lo, hi = ranks[0], (ranks[1] if len(ranks) > 1 else None)
+            rank = rank_between(lo and lo[0], hi and hi[0])
+            if rank is not None:
+                return rank
+            self._respace(project, file)
+        raise ValueError(f"No rank found for position {pos} in project '{project}' file {file}.")
+
+    def _respace(self, project, file):
+        rowids = self.conn.execute(
+            "SELECT rowid FROM entries WHERE project = ? AND file = ? ORDER BY rank", (project, file)
+        ).fetchall()
+        self.conn.executemany(
+            "UPDATE entries SET rank = ? WHERE rowid = ?", [(float(i), rowid) for i, (rowid,) in enumerate(rowids)]
+        )
+
+    def read(self, project, file):
+        import pandas as pd
+
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(columns)} FROM entries WHERE project = ? AND file = ? ORDER BY rank",
+            self.conn,
+            params=(project, file),
+        )
+        df["flagged"] = df["flagged"].astype(bool)
+        df["time_estimate"] = df["time_estimate"].astype(float)
+        return df
+
+    def write(self, project, file, df):
+        with self.tx():
+            self.conn.execute("DELETE FROM entries WHERE project = ? AND file = ?", (project, file))
+            self._insert_rows(project, file, df.to_dict("records"), 0)
+            self._bump(project, file)
+
+    def version(self, project, file):
+        # a per-list counter bumped in the same transaction as every change, so it holds across processes
+        row = self.conn.execute(
+            "SELECT version FROM versions WHERE project = ? AND file = ?", (project, file)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def count(self, project, file):
+        query = "SELECT COUNT(*) FROM entries WHERE project = ? AND file = ?"
+        return self.conn.execute(query, (project, file)).fetchone()[0]
+
+    def iter_rows(self, project, file, start=0, stop=None):
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM entries WHERE project = ? AND file = ? ORDER BY rank LIMIT ? OFFSET ?",
+            (project, file, -1 if stop is None else max(stop - start, 0), start),
+        )
+        for pos, values in enumerate(cursor, start=start):
+            row = dict(zip(columns, values))
+            row["flagged"] = bool(row["flagged"])
+            yield pos, row
+
+    def ids_at(self, project, file, positions):
+        rowids = self._rowids(project, file, list(positions))
+        found = dict(
+            self.conn.execute(
+                f"SELECT rowid, id FROM entries WHERE rowid IN ({', '.join('?' * len(rowids))})", list(rowids.values())
+            )
+        )
+        return [found.get(rowids.get(pos)) for pos in positions]
+
+    def locate(self, project, file, entry_id):
+        row = self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM entries e WHERE e.project = x.project AND e.file = x.file AND e.rank < x.rank) "
+            "FROM entries x WHERE project = ? AND file = ? AND id = ?",
+            (project, file, entry_id),
+        ).fetchone()
+        return row[0] if row else None
+
+    def stats(self, project, file):
+        n, total, flagged = self.conn.execute(
+            "SELECT COUNT(*), TOTAL(time_estimate), TOTAL(flagged) FROM entries WHERE project = ? AND file = ?",
+            (project, file),
+        ).fetchone()
+        scheduled = self.conn.execute(
+            "SELECT datetime_scheduled FROM entries WHERE project = ? AND file = ? AND datetime_scheduled IS NOT NULL",
+            (project, file),
+        ).fetchall()
+        scheduled = [datetime.strptime(s, date_format) for (s,) in scheduled]
+        return {
+            "n": n,
+            "total": round(total, 2),
+            "flagged": int(flagged),
+            "next_scheduled": min(scheduled).isoformat() if scheduled else None,
+        }
+
+    def insert(self, project, file, row, pos):
+        n = self.count(project, file)
+        with self.tx():
+            self._insert_rows(project, file, [row], self._rank_at(project, file, n if pos == -1 else min(pos, n)))
+            self._bump(project, file)
+
+    def append(self, project, file, rows):
+        n = self.count(project, file)
+        with self.tx():
+            self._insert_rows(project, file, rows, self._rank_at(project, file, n))
+            self._bump(project, file)
+
+    def update(self, project, file, pos, values):
+        assignments = ", ".join(f"{c} = ?" for c in values.keys() if c in columns)
+        with self.tx():
+            self.conn.execute(
+                f"UPDATE entries SET {assignments} WHERE rowid = ?",
+                [sql_value(v) for c, v in values.items() if c in columns] + [self._rowids(project, file, [pos])[pos]],
+            )
+            self._bump(project, file)
+
+    def delete(self, project, file, positions):
+        rowids = list(self._rowids(project, file, sorted(set(positions))).values())
+        with self.tx():
+            self.conn.execute(f"DELETE FROM entries WHERE rowid IN ({', '.join('?' * len(rowids))})", rowids)
+            self._bump(project, file)
+
+    def reorder(self, project, file, from_index, to_index):
+        n = self.count(project, file)
+        to_index = n - 1 if to_index == -1 else min(to_index, n - 1)
+        if from_index == to_index:
+            return
+        rowid = self._rowids(project, file, [from_index])[from_index]
+        with self.tx():
+            rank = self._rank_at(project, file, to_index, exclude=rowid)
+            self.conn.execute("UPDATE entries SET rank = ? WHERE rowid = ?", (rank, rowid))
+            self._bump(project, file)
+
+    def create_project(self, project):
+        os.makedirs(f"{data_path}/projects/{project}")
+
+    def remove_project(self, project):
+        with self.tx():
+            self.conn.execute("DELETE FROM entries WHERE project = ?", (project,))
+            self.conn.execute("DELETE FROM versions WHERE project = ?", (project,))
+        from shutil import rmtree
+
+        rmtree(f"{data_path}/projects/{project}")
+
+
+class CachedStore(Store):
+    """Wrap a store and keep lists in memory between reads, revalidated against the backend's version token.
+
+    Used by the resident daemon so repeated commands do not re-parse unchanged lists.
+    """
+
+    def __init__(self, store: Store):
+        self.store = store
+        self.name = store.name
+        self.concurrent_reads = store.concurrent_reads
+        self.cache = {}
+
+    def read(self, project, file):
+        version = self.store.version(project, file)
+        cached = self.cache.get((project, file))
+        if version is not None and cached and cached[0] == version:
+            return cached[1].copy()
+        df = self.store.read(project, file)
+        self.cache[(project, file)] = (version, df)
+        return df.copy()
+
+    def write(self, project, file, df):
+        self.store.write(project, file, df)
+        self.cache[(project, file)] = (self.store.version(project, file), df.reset_index(drop=True).copy())
+
+    def version(self, project, file):
+        return self.store.version(project, file)
+
+    def appends_rows(self, file):
+        return self.store.appends_rows(file)
+
+    def count(self, project, file):
+        return self.store.count(project, file)
+
+    def locate(self, project, file, entry_id):
+        return self.store.locate(project, file, entry_id)
+
+    def ids_at(self, project, file, positions):
+        return self.store.ids_at(project, file, positions)
+
+    def stats(self, project, file):
+        return self.store.stats(project, file)
+
+    def iter_rows(self, project, file, start=0, stop=None):
+        return self.store.iter_rows(project, file, start, stop)
+
+    def iter_since(self, project, file, since):
+        return self.store.iter_since(project, file, since)
+
+    @contextmanager
+    def transaction(self):
+        try:
+            with self.store.transaction():
+                yield
+        except BaseException:
+            # lists written inside a rolled-back transaction were cached as if committed
+            self.cache = {}
+            raise
+
+    def apply(self, project, file, op):
+        self.cache.pop((project, file), None)
+        self.store.apply(project, file, op)
+
+    def insert(self, project, file, row, pos):
+        self.cache.pop((project, file), None)
+        self.store.insert(project, file, row, pos)
+
+    def update(self, project, file, pos, values):
+        self.cache.pop((project, file), None)
+        self.store.update(project, file, pos, values)
+
+    def append(self, project, file, rows):
+        self.cache.pop((project, file), None)
+        self.store.append(project, file, rows)
+
+    def delete(self, project, file, positions):
+        self.cache.pop((project, file), None)
+        self.store.delete(project, file, positions)
+
+    def reorder(self, project, file, from_index, to_index):
+        self.cache.pop((project, file), None)
+        self.store.reorder(project, file, from_index, to_index)
+
+    def create_project(self, project):
+        self.store.create_project(project)
+
+    def remove_project(self, project):
+        self.store.remove_project(project)
+        self.cache = {k: v for k, v in self.cache.items() if k[0] != project}
+
+
+class BufferedStore(Store):
+    """Apply every change to in-memory lists and write each touched list once on flush().
+
+    Used by batch mode. The wrapped store is only read on first access to a list and written in flush(), inside a
+    single backend transaction.
+    """
+
+    def __init__(self, store: Store):
+        self.store = store
+        self.name = store.name
+        self.concurrent_reads = store.concurrent_reads
+        self.lists = {}
+        self.dirty = set()
+
+    def read(self, project, file):
+        if (project, file) not in self.lists:
+            self.lists[(project, file)] = self.store.read(project, file)
+        return self.lists[(project, file)].copy()
+
+    def write(self, project, file, df):
+        self.lists[(project, file)] = df.reset_index(drop=True)
+        self.dirty.add((project, file))
+
+    def count(self, project, file):
+        return len(self.read(project, file))
+
+    def create_project(self, project):
+        raise NotImplementedError("Projects cannot be created in batch mode.")
+
+    def remove_project(self, project):
+        raise NotImplementedError("Projects cannot be removed in batch mode.")
+
+    def flush(self) -> list:
+        """Write every touched list once. Returns the (project, file) pairs written."""
+        written = sorted(self.dirty)
+        with self.store.transaction():
+            for project, file in written:
+                self.store.write(project, file, self.lists[(project, file)])
+        self.dirty = set()
+        return written
+
+
+class HookedStore(Store):
+    """Wrap the backend and call every function in 'hooks' after each change, e.g. to keep per-list stats current.
+
+    Hooks are called as hook(store, project, file, op) with the row-level op, {"op": "write", "df": df} for whole-list
+    writes, or {"op": "create"} / {"op": "remove"} (file None) for projects. Update and delete ops also carry the
+    affected entry IDs ('id' / 'ids'), and row-level ops the list's version token from before the change ('before'),
+    so derived data can tell whether it was current when the change was made.
+    """
+
+    def __init__(self, store: Store):
+        self.store = store
+        self.name = store.name
+        self.concurrent_reads = store.concurrent_reads
+
+    def __getattr__(self, attr):
+        return getattr(self.store, attr)
+
+    @profiled("hooks")
+    def notify(self, project, file, op):
+        for hook in hooks:
+            hook(self.store, project, file, op)
+
+    @profiled("read")
+    def read(self, project, file):
+        df = self.store.read(project, file)
+        if "id" not in df.columns or df["id"].isna().any():
+            # lists written before entries had IDs get them once
+            with project_lock(project):
+                df = self.store.read(project, file)
+                if "id" not in df.columns or df["id"].isna().any():
+                    df = assign_ids(df)
+                    self.write(project, file, df)
+        return df
+
+    def locate(self, project, file, entry_id):
+        return self.store.locate(project, file, entry_id)
+
+    def ids_at(self, project, file, positions):
+        return self.store.ids_at(project, file, positions)
+
+    @profiled("write")
+    def write(self, project, file, df):
+        with project_lock(project):
+            self.store.write(project, file, df)
+            self.notify(project, file, {"op": "write", "df": df})
+
+    def appends_rows(self, file):
+        return self.store.appends_rows(file)
+
+    def count(self, project, file):
+        return self.store.count(project, file)
+
+    def version(self, project, file):
+        return self.store.version(project, file)
+
+    def stats(self, project, file):
+        return self.store.stats(project, file)
+
+    def iter_rows(self, project, file, start=0, stop=None):
+        return self.store.iter_rows(project, file, start, stop)
+
+    def iter_since(self, project, file, since):
+        return self.store.iter_since(project, file, since)
+
+    def transaction(self):
+        return self.store.transaction()
+
+    @profiled("write")
+    def apply(self, project, file, op):
+        with project_lock(project):
+            before = self.store.version(project, file)
+            self.store.apply(project, file, op)
+            self.notify(project, file, {**op, "before": before})
+
+    @profiled("write")
+    def insert(self, project, file, row, pos):
+        with project_lock(project):
+            before = self.store.version(project, file)
+            self.store.insert(project, file, row, pos)
+            self.notify(project, file, {"op": "insert", "row": row, "pos": pos, "before": before})
+
+    @profiled("write")
+    def update(self, project, file, pos, values):
+        with project_lock(project):
+            before = self.store.version(project, file)
+            self.store.update(project, file, pos, values)
+            [entry_id] = self.store.ids_at(project, file, [pos])
+            op = {"op": "update", "pos": pos, "values": values, "id": entry_id, "before": before}
+            self.notify(project, file, op)
+
+    @profiled("write")
+    def delete(self, project, file, positions):
+        with project_lock(project):
+            before = self.store.version(project, file)
+            # hooks get the IDs of the deleted entries, which can no longer be looked up afterwards
+            ids = self.store.ids_at(project, file, positions)
+            self.store.delete(project, file, positions)
+            self.notify(project, file, {"op": "delete", "positions": list(positions), "ids": ids, "before": before})
+
+    @profiled("write")
+    def append(self, project, file, rows):
+        with project_lock(project):
+            before = self.store.version(project, file)
+            self.store.append(project, file, rows)
+            self.notify(project, file, {"op": "append", "rows": list(rows), "before": before})
+
+    @profiled("write")
+    def reorder(self, project, file, from_index, to_index):
+        with project_lock(project):
+            before = self.store.version(project, file)
+            self.store.reorder(project, file, from_index, to_index)
+            self.notify(project, file, {"op": "reorder", "from": from_index, "to": to_index, "before": before})
+
+    def create_project(self, project):
+        self.store.create_project(project)
+        self.notify(project, None, {"op": "create"})
+
+    def remove_project(self, project):
+        self.store.remove_project(project)
+        self.notify(project, None, {"op": "remove"})
+
+
+# update_columns first: update_stats reads the sidecar it maintains
+hooks = [update_columns, update_stats, clear_render_cache, index_ids, index_text, update_lengths]
+stores = {s.name: s for s in [CSVStore, JournalStore, SQLiteStore]}
+_store = None
+
+
+def get_store() -> Store:
+    """Return the process-wide store selected by the 'store' key of config.json (default 'csv')."""
+    global _store
+    if _store is None:
+        name = CONFIG_FULL.get("store", "csv")
+        if name not in stores:
+            raise ValueError(f"Store '{name}' not recognised. Available stores are {list(stores.keys())}.")
+        _store = HookedStore(stores[name]())
+    return _store
+
+
+def set_store(store: Store) -> None:
+    """Replace the process-wide store (e.g. with a CachedStore in the daemon)."""
+    global _store
+    _store = store
+
+
+def apply_op(df: pd.DataFrame, op: dict) -> pd.DataFrame:
+    """Return 'df' with one row-level op applied. Ops are plain dicts so they can be journalled as JSON."""
+    if op["op"] == "insert":
+        return move(append_rows(df, [op["row"]]), from_index=-1, to_index=op["pos"])
+    elif op["op"] == "update":
+        for col, value in op["values"].items():
+            df[col] = df[col].astype(object)
+            df.iloc[op["pos"], df.columns.get_loc(col)] = value
+        return df
+    elif op["op"] == "delete":
+        return df.drop(index=df.index[op["positions"]]).reset_index(drop=True)
+    elif op["op"] == "append":
+        return append_rows(df, op["rows"])
+    elif op["op"] == "reorder":
+        return move(df, from_index=op["from"], to_index=op["to"])
+    raise ValueError(f"Unknown op '{op['op']}'.")
+
+
+def rank_between(lo, hi):
+    """A rank key between 'lo' and 'hi' (either may be None for the ends of a list), or None if they are too close
+    together for one to fit and the list needs respacing."""
+    if lo is None or hi is None:
+        return 0.0 if lo is None and hi is None else (hi - 1.0 if lo is None else lo + 1.0)
+    rank = (lo + hi) / 2
+    return rank if hi - lo > rank_gap and lo < rank < hi else None
+
+
+def op_positions(op: dict) -> list:
+    """Positions a row-level op reads or changes (an insert's position, the reorder's endpoints, ...)."""
+    if op["op"] in ["insert", "update"]:
+        return [op["pos"]]
+    elif op["op"] == "delete":
+        return op["positions"]
+    elif op["op"] == "append":
+        return []
+    return [op["from"], op["to"]]
+
+
+def check_op(op: dict, n: int) -> None:
+    """Raise ValueError unless 'op' applies to a list of 'n' rows (-1 is the last row, or the end for an insert)."""
+    if op["op"] == "insert":
+        valid = op["pos"] == -1 or 0 <= op["pos"] <= n
+    elif op["op"] == "reorder":
+        valid = 0 <= (n - 1 if op["from"] == -1 else op["from"]) < n and op["to"] >= -1
+    else:
+        valid = all(0 <= pos < n for pos in op_positions(op))
+    if not valid:
+        raise ValueError(f"Op '{op['op']}' at {op_positions(op)} does not apply to a list of {n} entries.")
+
+
+def shift_op(op: dict, by: int) -> dict:
+    """'op' with every position moved by 'by'."""
+    if op["op"] in ["insert", "update"]:
+        return {**op, "pos": op["pos"] + by}
+    elif op["op"] == "delete":
+        return {**op, "positions": [p + by for p in op["positions"]]}
+    elif op["op"] == "append":
+        return op
+    return {**op, "from": op["from"] + by, "to": op["to"] + by}
+
+
+def window_stop(stop, pos: int):
+    """islice stop within a part of a list that starts at 'pos'."""
+    return None if stop is None else max(stop - pos, 0)
+
+
+def append_rows(df: pd.DataFrame, rows: list) -> pd.DataFrame:
+    import pandas as pd
+
+    if not rows:
+        return df
+    new = pd.DataFrame(rows, columns=df.columns)
+    return pd.concat([df, new], ignore_index=True) if len(df) else new
+
+
+def csv_row(record: dict) -> dict:
+    """A csv.DictReader record typed the way pd.read_csv types it (empty cells NaN, floats, booleans)."""
+    row = {k: v if v != "" else float("NaN") for k, v in record.items()}
+    row["time_estimate"] = float(row["time_estimate"])
+    row["flagged"] = row["flagged"] == "True"
+    return row
+
+
+def json_value(value):
+    """json.dumps fallback for numpy scalars."""
+    return sql_value(value)
+
+
+def sql_value(value):
+    """Map pandas missing values to NULL and numpy scalars to Python types for sqlite3."""
+    if value is None:
+        return None
+    if isinstance(value, float) and value != value:
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+        return None if isinstance(value, float) and value != value else value
+    return value
@@ -7,20 +7,20 @@ $ hideproj PROJECT
 
 # base imports
 import argparse
-import json
 
 from task_terminal import lst
 
-from .helpers.helpers import check_init, data_path, pkg_path, reformat, timed_sleep
-
-# establish parameters
-templates = json.load(open(f"{pkg_path}/helpers/templates.json"))
-project_list = json.load(open(f"{data_path}/project_list.json", "r"))
-hidden_list = json.load(open(f"{data_path}/hidden_project_list.json", "r"))
+from .helpers.daemon import forward
+from .helpers.helpers import check_init, emit, machine_mode, reformat, timed_sleep
+from .helpers.locks import registry_lock
+from .helpers.state import session
 
 
 def main():
+    if forward("hideproj"):
+        return
     check_init()
+    templates = session.templates
 
     # establish parser to pull in projects to view
     parser = argparse.ArgumentParser(
@@ -38,6 +38,12 @@ def main():
         nargs="?",
         help="Project to hide.",
     )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, run non-interactively and print the result as JSON.",
+    )
     d = vars(parser.parse_args())
 
     helper_str = reformat(
@@ -46,19 +52,24 @@ def main():
     )
     if not d["project"]:
         raise ValueError(reformat("Project name must be provided.", input_type="error") + helper_str)
-    ref_ls = project_list if not d["U"] else hidden_list
-    if d["project"] not in ref_ls:
-        raise ValueError(reformat("Project not found in reference list.", input_type="error") + helper_str)
+    with registry_lock():
+        registry = session.registry(fresh=True)
+        project_list, hidden_list = registry["active"], registry["hidden"]
+        ref_ls = project_list if not d["U"] else hidden_list
+        if d["project"] not in ref_ls:
+            raise ValueError(reformat("Project not found in reference list.", input_type="error") + helper_str)
 
-    if not d["U"]:
-        hidden_list.append(d["project"])
-        project_list.remove(d["project"])
-    else:
-        hidden_list.remove(d["project"])
-        project_list.append(d["project"])
-    json.dump(project_list, open(f"{data_path}/project_list.json", "w"))
-    json.dump(hidden_list, open(f"{data_path}/hidden_project_list.json", "w"))
+        if not d["U"]:
+            hidden_list.append(d["project"])
+            project_list.remove(d["project"])
+        else:
+            hidden_list.remove(d["project"])
+            project_list.append(d["project"])
+        session.save_registry(active=project_list, hidden=hidden_list)
     type_str = "added to" if not d["U"] else "removed from"
+    if machine_mode():
+        emit({"command": "hideproj", "project": d["project"], "hidden": not d["U"]})
+        return
     print(reformat(f"Project {d['project']} successfully {type_str} hidden list."))
 
     timed_sleep()
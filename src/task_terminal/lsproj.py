@@ -3,21 +3,26 @@
 Show projects currently available.
 
 $ lsproj
+$ lsproj -json
 """
 
-# base imports
-import json
-
-from .helpers.helpers import check_init, data_path, halftab
-
-check_init()
+from .helpers.daemon import forward
+from .helpers.helpers import check_init, emit, halftab, machine_mode
+from .helpers.state import session
 
 
 def main():
+    if forward("lsproj"):
+        return
+    check_init()
+
     # establish parameters
-    project_list = json.load(open(f"{data_path}/project_list.json", "r"))
-    hidden_list = json.load(open(f"{data_path}/hidden_project_list.json", "r"))
+    project_list = session.projects
+    hidden_list = session.hidden
 
+    if machine_mode():
+        emit({"command": "lsproj", "active": project_list, "hidden": hidden_list})
+        return
     print(f"\n{halftab}Active projects: {project_list}")
     print(f"\n{halftab}Hidden projects: {hidden_list}\n")
 
@@ -6,42 +6,71 @@ Usage:
 $ lst all LIST
 $ lst PROJECT LIST
 $ lst PROJECT LIST IDX
+$ lst PROJECT LIST -json
+$ lst PROJECT LIST -tail 20
+$ lst PROJECT LIST -offset 100 -limit 50 -pager
+$ lst PROJECT archives -since 09/01/2026
 """
 
 # base imports
 import argparse
 import json
 import os
+from datetime import datetime
+from itertools import islice
 
-import pandas as pd
-
+from .helpers.daemon import forward
 from .helpers.helpers import (
     DEFAULT_FILE,
     check_init,
     check_scheduled,
     data_path,
     define_idx,
+    emit,
     file_options,
+    iter_entries,
+    machine_mode,
     parse_description,
     parse_entries,
-    pkg_path,
     print_lines,
     process_file,
+    records,
     reformat,
+    render_lists,
+    stream_lines,
+    valid_pos,
 )
+from .helpers.locks import write_json
+from .helpers.state import session
+from .helpers.stats import get_stats
+from .helpers.store import get_store
 
-templates = json.load(open(f"{pkg_path}/helpers/templates.json"))
 WIDTH = 55
 
 
+def window(project: str, file: str, d: dict) -> tuple:
+    """(start, stop) positions selected by -offset / -tail and -limit. -tail takes the count from the stats manifest."""
+    start = max(get_stats(project, file)["n"] - d["tail"], 0) if d["tail"] is not None else d["offset"] or 0
+    stop = start + d["limit"] if d["limit"] is not None else None
+    return start, stop
+
+
+def selected_rows(store, project: str, file: str, d: dict):
+    """(position, row) pairs selected by -since or by window(). Archive segments older than -since are not read."""
+    if d["since"] is None:
+        return store.iter_rows(project, file, *window(project, file, d))
+    return islice(store.iter_since(project, file, datetime.strptime(d["since"], "%m/%d/%Y")), d["limit"])
+
+
 def main(parse_args=True):
+    if parse_args and forward("lst"):
+        return
 
-    # establish parameters
-    project_list = json.load(open(f"{data_path}/project_list.json", "r"))
-    hidden_list = json.load(open(f"{data_path}/hidden_project_list.json", "r"))
-    project_list = [p for p in project_list if p not in hidden_list]
     check_init()
-    check_scheduled()
+
+    # establish parameters
+    templates = session.templates
+    project_list = session.visible
 
     # establish parser to pull in projects to view
     parser = argparse.ArgumentParser(description="Display contents of list or entry.")
@@ -65,7 +94,7 @@ def main(parse_args=True):
         "pos",
         type=str,
         nargs="?",
-        help="Position of item within list for which to display description.",
+        help="Position (or ID) of item within list for which to display description.",
     )
     parser.add_argument(
         "-flagged",
@@ -73,17 +102,51 @@ def main(parse_args=True):
         default=False,
         help="If provided, list only flagged entries.",
     )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, print the list (or entry) as JSON instead of the rendered table.",
+    )
+    parser.add_argument(
+        "-limit",
+        type=int,
+        help="Show at most this many entries. Entries are read and printed as they are rendered.",
+    )
+    parser.add_argument(
+        "-offset",
+        type=int,
+        help="Position of the first entry to show.",
+    )
+    parser.add_argument(
+        "-tail",
+        type=int,
+        help="Show only the last N entries.",
+    )
+    parser.add_argument(
+        "-since",
+        type=str,
+        help="Show only entries moved to (or, if never moved, created in) the list on or after this date (MM/DD/YYYY).",
+    )
+    parser.add_argument(
+        "-pager",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, pause after every screenful of entries.",
+    )
 
     last_lst_path = f"{data_path}/last_lst.json"
     if parse_args:
         d = vars(parser.parse_args())
-        json.dump(d, open(last_lst_path, "w"))
+        write_json(last_lst_path, {k: v for k, v in d.items() if k not in ["json", "pager"]})
     else:
         d = vars(parser.parse_args([]))
         if os.path.isfile(last_lst_path):
             last_lst_params = json.load(open(f"{data_path}/last_lst.json", "r"))
             d.update(last_lst_params)
 
+    released = check_scheduled()
+
     if d["pos"] and d["ref_proj"] in ["all", "ALL"]:
         raise ValueError(
             reformat(
@@ -91,13 +154,24 @@ def main(parse_args=True):
                 input_type="error",
             )
         )
-    if d["pos"] not in [None, "HEAD", "TAIL"] + [str(i) for i in range(100)]:
+    if not valid_pos(d["pos"]):
         raise ValueError(
             reformat(
-                "'pos' must be one of 'HEAD', 'TAIL', 0, or a positive integer less than 100.",
+                "'pos' must be one of 'HEAD', 'TAIL', 0, a positive integer, or an entry ID.",
                 input_type="error",
             )
         )
+    if d["tail"] is not None and d["offset"] is not None:
+        raise ValueError(reformat("Use either '-tail' or '-offset', not both.", input_type="error"))
+    if d["since"] is not None and (d["tail"] is not None or d["offset"] is not None):
+        raise ValueError(reformat("Use '-since' with '-limit' only, not '-tail' or '-offset'.", input_type="error"))
+    if d["since"] is not None:
+        try:
+            datetime.strptime(d["since"], "%m/%d/%Y")
+        except ValueError:
+            raise ValueError(reformat("'-since' must be a date in MM/DD/YYYY format.", input_type="error"))
+    if any(d[k] is not None and d[k] < 0 for k in ["limit", "offset", "tail"]):
+        raise ValueError(reformat("'-limit', '-offset' and '-tail' must be zero or positive.", input_type="error"))
     if len(project_list) == 0:
         raise ValueError(
             reformat(
@@ -116,23 +190,61 @@ def main(parse_args=True):
             )
         )
 
+    store = get_store()
     file = process_file(d["file"])
+    projects = project_list if d["ref_proj"] in ["all", "ALL"] else [d["ref_proj"]]
+    streaming = d["pager"] or any(d[k] is not None for k in ["limit", "offset", "tail", "since"])
+
+    if machine_mode():
+        result = {"command": "lst", "file": file, "released": {k: v for k, v in released.items() if v}}
+        if d["pos"] is None and streaming:
+            result["projects"] = {
+                proj: records(row for _, row in selected_rows(store, proj, file, d)) for proj in projects
+            }
+        elif d["pos"] is None:
+            lists = store.read_many([(proj, file) for proj in projects])
+            result["projects"] = {proj: records(lists[(proj, file)]) for proj in projects}
+        else:
+            df = store.read(d["ref_proj"], file)
+            idx = define_idx(d["pos"], df)
+            if idx not in df.index:
+                raise ValueError(
+                    reformat(
+                        f"Provided index not found in project '{d['ref_proj']}' file '{file}'.", input_type="error"
+                    )
+                )
+            result.update(project=d["ref_proj"], pos=idx, entry=records(df.iloc[[idx]])[0])
+        emit(result)
+        return
+
+    if streaming and d["pos"] is None:
+        print(f"\n---{file.upper()}---")
+
+        def lines():
+            for proj in projects:
+                rows = selected_rows(store, proj, file, d)
+                yield from iter_entries(store, proj, file, WIDTH, flagged=d["flagged"], rows=rows)
+            yield ""
+
+        stream_lines(lines(), pager=d["pager"])
+        return
 
     if d["ref_proj"] in ["all", "ALL"]:
         lines = []
+        blocks = render_lists(store, project_list, file, width=WIDTH, flagged=d["flagged"])
         for proj in project_list:
-            df = pd.read_csv(f"{data_path}/projects/{proj}/{file}.csv")
-            proj_lines = parse_entries(df, project=proj, file=file, width=WIDTH)
+            proj_lines = parse_entries(None, project=proj, file=file, width=WIDTH, rows=blocks[proj])
             lines += proj_lines
         lines += [""]
     else:
-        df = pd.read_csv(f"{data_path}/projects/{d['ref_proj']}/{file}.csv")
         if d["pos"] is None:
-            lines = parse_entries(df, project=d["ref_proj"], file=file, width=WIDTH)
+            blocks = render_lists(store, [d["ref_proj"]], file, width=WIDTH, flagged=d["flagged"])
+            lines = parse_entries(None, project=d["ref_proj"], file=file, width=WIDTH, rows=blocks[d["ref_proj"]])
             lines += [""]
         else:
+            df = store.read(d["ref_proj"], file)
             idx = define_idx(d["pos"], df)
-            if idx not in list(df.index):
+            if idx not in df.index:
                 raise ValueError(
                     reformat(
                         f"Provided index not found in project '{d['ref_proj']}' file '{file}'. To view file contents, run {templates['list_proj_and_type']}.",
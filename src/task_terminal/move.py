@@ -1,43 +1,49 @@
 #!/usr/bin/env python3
-""" Move item in list to another position or to tail of another list.
+"""Move item in list to another position or to tail of another list.
 
 $ move PROJECT LIST FROM_IDX TO_IDX
 $ move PROJECT FROM_LIST FROM_IDX TO_LIST
+$ move PROJECT FROM_LIST FROM_IDX TO_LIST -when WHEN -json
 """
 
 import argparse
-import json
 from contextlib import suppress
 from datetime import datetime
 
-import pandas as pd
-from termcolor import colored
-
 from task_terminal import lst
 
+from .helpers.daemon import forward
 from .helpers.helpers import (
     CONFIG,
+    ask,
     check_init,
-    data_path,
+    date_format,
     define_idx,
+    define_store_idx,
+    emit,
     file_options,
-    move,
-    pkg_path,
+    machine_mode,
+    note_scheduled,
     process_file,
     reformat,
     reformat_date,
     timed_sleep,
-    transfer_row,
+    valid_pos,
 )
-
-# establish parameters
-templates = json.load(open(f"{pkg_path}/helpers/templates.json"))
-project_list = json.load(open(f"{data_path}/project_list.json", "r"))
+from .helpers.locks import project_lock
+from .helpers.state import session
+from .helpers.store import get_store
 
 
 def main():
+    if forward("move"):
+        return
     check_init()
 
+    # establish parameters
+    templates = session.templates
+    project_list = session.projects
+
     # establish parser to pull in projects to view
     parser = argparse.ArgumentParser(description="Move item in list to another position or to tail of another list.")
     parser.add_argument(
@@ -58,7 +64,7 @@ def main():
         "from",
         type=str,
         nargs="?",
-        help="Index from which to move. Accepted arguments are zero / positive integer indices, 'HEAD', and 'TAIL'.",
+        help="Index from which to move. Accepted arguments are zero / positive integer indices, 'HEAD', 'TAIL', and entry IDs.",
     )
     parser.add_argument(
         "to",
@@ -72,6 +78,17 @@ def main():
         default=False,
         help="If provided, explicitly schedule next pull after move.",
     )
+    parser.add_argument(
+        "-when",
+        type=str,
+        help="Release time (%%-m/%%-d %%H:%%M) when moving to a scheduled list. Prompted for if not provided.",
+    )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, run non-interactively (all values from flags) and print the result as JSON.",
+    )
     d = vars(parser.parse_args())
 
     if len(project_list) == 0:
@@ -97,70 +114,87 @@ def main():
                 input_type="error",
             )
         )
-    if d["from"] not in [None, "HEAD", "TAIL"] + [str(i) for i in range(100)]:
+    if not valid_pos(d["from"]):
         raise ValueError(
             reformat(
-                "'from' must be one of 'HEAD', 'TAIL', 0, or a positive integer less than 100.",
+                "'from' must be one of 'HEAD', 'TAIL', 0, a positive integer, or an entry ID.",
                 input_type="error",
             )
         )
     send_to_file = False
-    if d["to"] not in [None, "HEAD", "TAIL"] + [str(i) for i in range(100)]:
-        try:
-            to_file = process_file(d["to"])
-            send_to_file = True
-        except:
-            raise ValueError(
-                reformat(
-                    f"'to' must be one of 'HEAD', 'TAIL', 0, or a positive integer less than 100 OR be an existing project in {project_list}.",
-                    input_type="error",
-                )
+    if d["to"] in file_options:
+        to_file = process_file(d["to"])
+        send_to_file = True
+    elif not valid_pos(d["to"]):
+        raise ValueError(
+            reformat(
+                f"'to' must be one of 'HEAD', 'TAIL', 0, a positive integer, or an entry ID OR be a list in {file_options}.",
+                input_type="error",
             )
+        )
 
+    from termcolor import colored
+
+    store = get_store()
     if not send_to_file:
         if d["schedule"]:
             raise ValueError(reformat("Movements within file do not accept -schedule kwarg.", input_type="error"))
         file = process_file(d["file"])
 
-        path = f"{data_path}/projects/{d['ref_proj']}/{file}.csv"
-        df = pd.read_csv(path)
-
-        from_idx = define_idx(d["from"], df)
-        to_idx = define_idx(d["to"], df)
-        df = move(df, from_index=from_idx, to_index=to_idx)
-        df.to_csv(path, index=False)
+        with project_lock(d["ref_proj"]):
+            from_idx = define_store_idx(d["from"], store, d["ref_proj"], file)
+            to_idx = define_store_idx(d["to"], store, d["ref_proj"], file)
+            store.reorder(d["ref_proj"], file, from_index=from_idx, to_index=to_idx)
+        if machine_mode():
+            emit({"command": "move", "project": d["ref_proj"], "file": file, "from": from_idx, "to": to_idx})
+            return
         print(reformat(f"Entry {from_idx} successfully moved to position {to_idx}."))
     else:
         from_file = process_file(d["file"])
-        from_path = f"{data_path}/projects/{d['ref_proj']}/{from_file}.csv"
-        to_path = f"{data_path}/projects/{d['ref_proj']}/{to_file}.csv"
-        from_df = pd.read_csv(from_path)
-        to_df = pd.read_csv(to_path)
-
-        from_idx = define_idx(d["from"], from_df)
-        from_df, to_df = transfer_row(from_idx, from_df, to_df)
+        scheduled = None
         if ("attrs" in CONFIG[to_file].keys() and "schedule" in CONFIG[to_file]["attrs"]) or d["schedule"]:
             if "pull_to" not in CONFIG[to_file].keys():
                 raise ValueError(reformat("Cannot schedule an entry to a file with no 'pull_to' parameter."))
-            scheduled = ""
+            scheduled = reformat_date(d["when"]) if d["when"] else ""
+            if d["when"] and not scheduled > datetime.now():
+                raise ValueError(reformat(f"'-when' {scheduled} is not in the future.", input_type="error"))
             while type(scheduled) is not datetime or not scheduled > datetime.now():
+                # only the parse is retried; a missing '-when' in machine mode raises
+                answer = ask("When should this be released? (%-m/%-d %H:%M)", "-when")
                 with suppress(ValueError):
-                    scheduled = input(
-                        reformat(
-                            "When should this be released? (%-m/%-d %H:%M)",
-                            input_type="input",
-                        )
+                    scheduled = reformat_date(answer)
+
+        with project_lock(d["ref_proj"]):
+            from_df = store.read(d["ref_proj"], from_file)
+            from_idx = define_idx(d["from"], from_df)
+            if from_idx not in from_df.index:
+                raise ValueError(
+                    reformat(
+                        f"Provided index not found in project '{d['ref_proj']}' file {from_file}.",
+                        input_type="error",
                     )
-                    scheduled = reformat_date(scheduled)
-            to_df.loc[len(to_df) - 1, "datetime_scheduled"] = scheduled.strftime("%m/%d/%Y %H:%M:%S")
-        to_df.to_csv(to_path, index=False)
-        from_df.to_csv(from_path, index=False)
+                )
+            values = {"datetime_scheduled": scheduled.strftime(date_format)} if scheduled else None
+            moved = store.transfer(d["ref_proj"], from_file, to_file, [from_idx], values=values)
+            note_scheduled(d["ref_proj"], to_file, moved.iloc[0]["datetime_scheduled"])
+        if machine_mode():
+            emit(
+                {
+                    "command": "move",
+                    "project": d["ref_proj"],
+                    "file": from_file,
+                    "from": from_idx,
+                    "to": to_file,
+                    "datetime_scheduled": moved.iloc[0]["datetime_scheduled"],
+                }
+            )
+            return
         print(reformat(f"{from_file.capitalize()} item {from_idx} moved successfully to {to_file.capitalize()}."))
         if "pull_to" not in CONFIG[to_file].keys():
             print(
                 reformat(
                     colored(
-                        "-- \u263A Nice job! \u263A --",
+                        "-- \u263a Nice job! \u263a --",
                         color="green",
                         attrs=["bold", "blink"],
                     )
@@ -6,17 +6,18 @@ $ moveproj FROM_IDX TO_IDX
 """
 
 import argparse
-import json
 
 from task_terminal import lst
 
-from .helpers.helpers import check_init, data_path, define_idx, reformat, timed_sleep
-
-# establish parameters
-project_list = json.load(open(f"{data_path}/project_list.json", "r"))
+from .helpers.daemon import forward
+from .helpers.helpers import check_init, define_idx, emit, machine_mode, reformat, timed_sleep
+from .helpers.locks import registry_lock
+from .helpers.state import session
 
 
 def main():
+    if forward("moveproj"):
+        return
     check_init()
 
     # establish parser to pull in projects to view
@@ -33,14 +34,25 @@ def main():
         nargs="?",
         help="Index to which item should be moved.",
     )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, run non-interactively and print the result as JSON.",
+    )
     d = vars(parser.parse_args())
 
-    from_idx = define_idx(d["from"], project_list)
-    to_idx = define_idx(d["to"], project_list)
-    proj_to_move = project_list[from_idx]
-    del project_list[from_idx]
-    project_list.insert(to_idx, proj_to_move)
-    json.dump(project_list, open(f"{data_path}/project_list.json", "w"))
+    with registry_lock():
+        project_list = session.registry(fresh=True)["active"]
+        from_idx = define_idx(d["from"], project_list)
+        to_idx = define_idx(d["to"], project_list)
+        proj_to_move = project_list[from_idx]
+        del project_list[from_idx]
+        project_list.insert(to_idx, proj_to_move)
+        session.save_registry(active=project_list)
+    if machine_mode():
+        emit({"command": "moveproj", "project": proj_to_move, "from": from_idx, "to": to_idx})
+        return
     print(reformat(f"Project {proj_to_move} successfully moved from position {from_idx} to position {to_idx}."))
 
     timed_sleep()
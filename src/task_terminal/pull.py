@@ -8,35 +8,38 @@ $ pull PROJECT FILE IDX -U
 
 # base imports
 import argparse
-import json
 import warnings
 
-import pandas as pd
-from termcolor import colored
-
 from task_terminal import lst
 
+from .helpers.daemon import forward
 from .helpers.helpers import (
     CONFIG,
     check_init,
-    data_path,
     define_idx,
+    emit,
     file_options,
-    pkg_path,
+    machine_mode,
+    note_scheduled,
     process_file,
     reformat,
     timed_sleep,
-    transfer_row,
+    valid_pos,
 )
-
-# establish parameters
-templates = json.load(open(f"{pkg_path}/helpers/templates.json"))
-project_list = json.load(open(f"{data_path}/project_list.json", "r"))
+from .helpers.locks import project_lock
+from .helpers.state import session
+from .helpers.store import get_store
 
 
 def main():
+    if forward("pull"):
+        return
     check_init()
 
+    # establish parameters
+    templates = session.templates
+    project_list = session.projects
+
     # establish parser to pull in projects to view
     parser = argparse.ArgumentParser(
         description="Move item to list's 'pull_to' location if -U not specified, or to 'push_to' location if -U is specified."
@@ -59,7 +62,7 @@ def main():
         "pos",
         type=str,
         nargs="+",
-        help="Position of entry.",
+        help="Position (or ID) of entry.",
     )
     parser.add_argument(
         "-U",
@@ -67,6 +70,12 @@ def main():
         default=False,
         help="If provided, send to 'push_to' location.",
     )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, run non-interactively and print the result as JSON.",
+    )
     d = vars(parser.parse_args())
 
     if not d["ref_proj"] or not d["pos"]:
@@ -76,10 +85,10 @@ def main():
                 input_type="error",
             )
         )
-    if not all(x in [None, "HEAD", "TAIL"] + [str(i) for i in range(100)] for x in d["pos"]):
+    if not all(valid_pos(x) for x in d["pos"]):
         raise ValueError(
             reformat(
-                "'pos' entries must be one of 'HEAD', 'TAIL', 0, or a positive integer less than 100",
+                "'pos' entries must be one of 'HEAD', 'TAIL', 0, a positive integer, or an entry ID",
                 input_type="error",
             )
         )
@@ -105,6 +114,8 @@ def main():
             )
         )
 
+    from termcolor import colored
+
     d["file"] = process_file(d["file"])
 
     if not d["U"]:
@@ -126,38 +137,41 @@ def main():
             )
         to_file = CONFIG[d["file"]]["push_to"]
 
-    from_path = f"{data_path}/projects/{d['ref_proj']}/{d['file']}.csv"
-    to_path = f"{data_path}/projects/{d['ref_proj']}/{to_file}.csv"
-    from_df = pd.read_csv(from_path)
-    to_df = pd.read_csv(to_path)
+    store = get_store()
+    with project_lock(d["ref_proj"]):
+        from_df = store.read(d["ref_proj"], d["file"])
 
-    d["pos"] = [define_idx(i, from_df) for i in d["pos"]]
-    if len(set(d["pos"])) != len(d["pos"]):
-        warnings.warn(
-            reformat(
-                f"Dropping duplicate values in {d['pos']}. New indices are {list(set(d['pos']))}",
-                input_type="error",
+        d["pos"] = [define_idx(i, from_df) for i in d["pos"]]
+        if len(set(d["pos"])) != len(d["pos"]):
+            warnings.warn(
+                reformat(
+                    f"Dropping duplicate values in {d['pos']}. New indices are {list(set(d['pos']))}",
+                    input_type="error",
+                )
             )
-        )
-    d["pos"] = list(dict.fromkeys(d["pos"]))
+        d["pos"] = list(dict.fromkeys(d["pos"]))
 
-    for idx in d["pos"]:
-        if idx not in list(from_df.index):
+        if any(idx not in from_df.index for idx in d["pos"]):
             raise ValueError(
                 reformat(
                     f"Provided index not found in project '{d['ref_proj']}' file {d['file']}.",
                     input_type="error",
                 )
             )
-        from_df, to_df = transfer_row(idx, from_df, to_df)
-        to_df.to_csv(to_path, index=False)
-        from_df.to_csv(from_path, index=False)
+        moved = store.transfer(d["ref_proj"], d["file"], to_file, d["pos"])
+        for scheduled in moved["datetime_scheduled"].dropna().unique():
+            note_scheduled(d["ref_proj"], to_file, scheduled)
+
+    if machine_mode():
+        emit({"command": "pull", "project": d["ref_proj"], "file": d["file"], "to": to_file, "moved": d["pos"]})
+        return
+    for idx in d["pos"]:
         print(reformat(f"{d['file'].capitalize()} item {idx} moved successfully to {to_file.capitalize()}."))
         if "pull_to" not in CONFIG[to_file].keys():
             print(
                 reformat(
                     colored(
-                        "-- \u263A Nice job! \u263A --",
+                        "-- \u263a Nice job! \u263a --",
                         color="green",
                         attrs=["bold", "blink"],
                     )
@@ -3,39 +3,47 @@
 Delete item from list.
 
 $ rmfrom PROJECT LIST IDX
+$ rmfrom PROJECT LIST IDX IDX IDX
+$ rmfrom PROJECT LIST IDX -yes -json
 """
 
 # base imports
 import argparse
-import json
 import warnings
 
-import pandas as pd
-
 from task_terminal import lst
 
+from .helpers.daemon import forward
 from .helpers.helpers import (
     CONFIG,
     check_init,
-    data_path,
     define_idx,
+    emit,
     file_options,
     halftab,
-    pkg_path,
+    machine_mode,
     process_file,
     reformat,
+    relocate,
     set_entry_size,
+    set_entry_size_manual,
     timed_sleep,
+    valid_pos,
 )
-
-# establish parameters
-templates = json.load(open(f"{pkg_path}/helpers/templates.json"))
-project_list = json.load(open(f"{data_path}/project_list.json", "r"))
+from .helpers.locks import project_lock
+from .helpers.state import session
+from .helpers.store import get_store
 
 
 def main():
+    if forward("rmfrom"):
+        return
     check_init()
 
+    # establish parameters
+    templates = session.templates
+    project_list = session.projects
+
     # establish parser to pull in projects to view
     parser = argparse.ArgumentParser(description="Delete item from list.")
     parser.add_argument(
@@ -55,10 +63,29 @@ def main():
     parser.add_argument(
         "pos",
         nargs="+",
-        help="Positions from which to remove task. Accepted arguments are zero / positive integer indices, 'HEAD', and 'TAIL'.",
+        help="Positions from which to remove task. Accepted arguments are zero / positive integer indices, 'HEAD', 'TAIL', and entry IDs.",
+    )
+    parser.add_argument(
+        "-yes",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, remove without asking for confirmation.",
+    )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, run non-interactively and print the result as JSON. Requires -yes.",
     )
     d = vars(parser.parse_args())
 
+    if not all(valid_pos(x) for x in d["pos"]):
+        raise ValueError(
+            reformat(
+                "'pos' entries must be one of 'HEAD', 'TAIL', 0, a positive integer, or an entry ID",
+                input_type="error",
+            )
+        )
     if len(project_list) == 0:
         raise ValueError(
             reformat(
@@ -92,9 +119,8 @@ def main():
 
     file_name = process_file(d["file"])
 
-    base_path = f"{data_path}/projects/{d['ref_proj']}"
-    path = f"{base_path}/{file_name}.csv"
-    df = pd.read_csv(path)
+    store = get_store()
+    df = store.read(d["ref_proj"], file_name)
 
     d["pos"] = [define_idx(i, df) for i in d["pos"]]
     if len(set(d["pos"])) != len(d["pos"]):
@@ -105,25 +131,32 @@ def main():
             )
         )
     d["pos"] = list(dict.fromkeys(d["pos"]))
+    if machine_mode() and not d["yes"]:
+        raise ValueError(reformat("'-yes' must be provided in non-interactive mode.", input_type="error"))
 
-    for idx in d["pos"]:
-        if idx not in list(df.index):
-            raise ValueError(
-                reformat(
-                    f"Provided index not found in project '{d['ref_proj']}' file {file_name}.",
-                    input_type="error",
-                )
+    missing = [idx for idx in d["pos"] if idx not in df.index]
+    if missing:
+        raise ValueError(
+            reformat(
+                f"Provided index {missing} not found in project '{d['ref_proj']}' file {file_name}.",
+                input_type="error",
             )
-        iloc = df.index.get_loc(idx)
-        to_be_removed = df.iloc[iloc]
-        q_str = halftab + "Remove the below entry? (y/n)"
-        set_entry_size(
-            to_be_removed,
-            min_width=len(q_str) + 1,
-            additional_width=23,
-            max_width=72,
         )
-        confirmed = input(f"\n{q_str}\n{halftab}This action cannot be undone.\n\n{to_be_removed}\n{halftab}")
+
+    removed = d["pos"]
+    if not d["yes"]:
+        # one confirmation for every targeted entry
+        if len(removed) == 1:
+            q_str = halftab + "Remove the below entry? (y/n)"
+            shown = df.iloc[removed[0]]
+            set_entry_size(shown, min_width=len(q_str) + 1, additional_width=23, max_width=72)
+        else:
+            q_str = halftab + f"Remove the below {len(removed)} entries? (y/n)"
+            lines = [f"{halftab}{idx: >5}    {df.iloc[idx]['entry']}" for idx in removed]
+            shown = "\n".join(lines)
+            width = max(len(q_str), *[len(line) for line in lines]) + 4
+            set_entry_size_manual(height=len(lines) + 7, width=min(max(width, 60), 120))
+        confirmed = input(f"\n{q_str}\n{halftab}This action cannot be undone.\n\n{shown}\n{halftab}")
         while confirmed not in ["y", "Y"] + ["n", "N"]:
             confirmed = input(
                 reformat(
@@ -131,14 +164,22 @@ def main():
                     input_type="input",
                 )
             )
-        if confirmed in ["y", "Y"]:
-            df = df.loc[df.index != idx]
-            df.to_csv(path, index=False)
-            print(reformat(f"{file_name.capitalize()} item {idx} removed successfully."))
-        else:
+        if confirmed in ["n", "N"]:
             print(reformat("Action cancelled."))
-        timed_sleep()
-
+            timed_sleep()
+            lst.main(parse_args=False)
+            return
+
+    with project_lock(d["ref_proj"]):
+        # the list was read before the confirmation: delete the entries that were shown, wherever they are now
+        removed = relocate(store, d["ref_proj"], file_name, list(df.loc[removed, "id"]))
+        store.delete(d["ref_proj"], file_name, removed)
+    if machine_mode():
+        emit({"command": "rmfrom", "project": d["ref_proj"], "file": file_name, "removed": removed})
+        return
+    p = "s" if len(removed) > 1 else ""
+    print(reformat(f"{file_name.capitalize()} item{p} {removed} removed successfully."))
+    timed_sleep()
     lst.main(parse_args=False)
 
 
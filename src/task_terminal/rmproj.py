@@ -3,25 +3,25 @@
 Delete project.
 
 $ rmproj PROJECT
+$ rmproj PROJECT -yes -json
 """
 
 # base imports
 import argparse
-import json
 import os
-from shutil import rmtree
 
 from task_terminal import lst
 
-from .helpers.helpers import check_init, data_path, halftab, pkg_path, reformat, timed_sleep
-
-# establish parameters
-templates = json.load(open(f"{pkg_path}/helpers/templates.json"))
-project_list = json.load(open(f"{data_path}/project_list.json", "r"))
-hidden_list = json.load(open(f"{data_path}/hidden_project_list.json", "r"))
+from .helpers.daemon import forward
+from .helpers.helpers import check_init, data_path, emit, halftab, machine_mode, reformat, timed_sleep
+from .helpers.locks import registry_lock
+from .helpers.state import session
+from .helpers.store import get_store
 
 
 def main():
+    if forward("rmproj"):
+        return
     check_init()
 
     # establish parser to pull in projects to view
@@ -32,6 +32,18 @@ def main():
         nargs="?",
         help="Project to delete.",
     )
+    parser.add_argument(
+        "-yes",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, remove without asking for confirmation.",
+    )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, run non-interactively and print the result as JSON. Requires -yes.",
+    )
     d = vars(parser.parse_args())
 
     if not d["project"]:
@@ -39,9 +51,12 @@ def main():
     if not os.path.exists(f"{data_path}/projects/{d['project']}"):
         raise ValueError(reformat(f"Project '{d['project']}' does not exist.", input_type="error"))
 
-    base_path = f"{data_path}/projects/{d['project']}"
-    confirmed = None
-    confirmed = input(f"Remove {d['project']}? (y/n)\n{halftab}This action cannot be undone.\n{halftab}")
+    if machine_mode() and not d["yes"]:
+        raise ValueError(reformat("'-yes' must be provided in non-interactive mode.", input_type="error"))
+
+    confirmed = "y"
+    if not d["yes"]:
+        confirmed = input(f"Remove {d['project']}? (y/n)\n{halftab}This action cannot be undone.\n{halftab}")
     while confirmed not in ["y", "Y"] + ["n", "N"]:
         confirmed = input(
             reformat(
@@ -50,13 +65,18 @@ def main():
             )
         )
     if confirmed in ["y", "Y"]:
-        rmtree(base_path)
-        if d["project"] in project_list:
-            project_list.remove(d["project"])
-            json.dump(project_list, open(f"{data_path}/project_list.json", "w"))
-        else:
-            hidden_list.remove(d["project"])
-            json.dump(hidden_list, open(f"{data_path}/hidden_project_list.json", "w"))
+        with registry_lock():
+            get_store().remove_project(d["project"])
+            registry = session.registry(fresh=True)
+            if d["project"] in registry["active"]:
+                registry["active"].remove(d["project"])
+                session.save_registry(active=registry["active"])
+            else:
+                registry["hidden"].remove(d["project"])
+                session.save_registry(hidden=registry["hidden"])
+        if machine_mode():
+            emit({"command": "rmproj", "project": d["project"], "removed": True})
+            return
         print(reformat(f"Project '{d['project']}' removed successfully."))
 
     timed_sleep()
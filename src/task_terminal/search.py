@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Find entries by the words in their entry or description text. Every word must match, each as the start of a word
+('rep' matches 'report'). The index is built on first use and then kept current as lists change.
+
+$ search WORD [WORD ...]
+$ search WORD -list LIST -hidden -limit N
+$ search -rebuild
+"""
+
+# base imports
+import argparse
+
+from .helpers.daemon import forward
+from .helpers.helpers import CONFIG, check_init, emit, halftab, machine_mode, process_file, reformat
+from .helpers.search import exists, rebuild, search
+from .helpers.state import session
+from .helpers.store import get_store
+
+
+def main():
+    if forward("search"):
+        return
+    check_init()
+
+    parser = argparse.ArgumentParser(description="Find entries by text.")
+    parser.add_argument(
+        "query",
+        type=str,
+        nargs="*",
+        help="Words to find.",
+    )
+    parser.add_argument(
+        "-list",
+        type=str,
+        help="If provided, only search this list.",
+    )
+    parser.add_argument(
+        "-hidden",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, also search hidden projects.",
+    )
+    parser.add_argument(
+        "-limit",
+        type=int,
+        help="Maximum number of matches to show.",
+    )
+    parser.add_argument(
+        "-rebuild",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, rebuild the index from every list first.",
+    )
+    parser.add_argument(
+        "-json",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, print the matches as JSON.",
+    )
+    d = vars(parser.parse_args())
+
+    if not d["query"] and not d["rebuild"]:
+        raise ValueError(reformat("'query' must be provided.", input_type="error"))
+    if d["limit"] is not None and d["limit"] < 1:
+        raise ValueError(reformat("'-limit' must be a positive integer.", input_type="error"))
+
+    if d["rebuild"] or not exists():
+        n = rebuild(get_store(), session.projects + session.hidden)
+        if not d["query"]:
+            if machine_mode():
+                emit({"command": "search", "indexed": n})
+            else:
+                print(reformat(f"Indexed {n} entries."))
+            return
+
+    projects = session.projects + (session.hidden if d["hidden"] else [])
+    files = [process_file(d["list"])] if d["list"] else list(CONFIG.keys())
+    matches = search(" ".join(d["query"]), projects, files, limit=d["limit"])
+
+    if machine_mode():
+        emit({"command": "search", "query": d["query"], "matches": matches})
+        return
+    if not matches:
+        print(reformat("No matching entries."))
+        return
+    print()
+    for m in matches:
+        print(f"{halftab}{m['project']} / {m['file']} [{m['id']}] {m['entry']}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
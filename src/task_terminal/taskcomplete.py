@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Shell completion for projects, lists and positions. Print the script for a shell once and load it from the shell's
+startup file; the shell then calls 'taskcomplete -- WORDS' on each <TAB>.
+
+$ eval "$(taskcomplete bash)"            # ~/.bashrc
+$ eval "$(taskcomplete zsh)"             # ~/.zshrc, after compinit
+$ taskcomplete fish | source             # ~/.config/fish/config.fish
+$ taskcomplete -rebuild
+"""
+
+# base imports
+import sys
+
+from .helpers.completion import complete, grammar
+
+scripts = {
+    "bash": """
+_task_terminal() {
+    local IFS=$'\\n'
+    COMPREPLY=($(taskcomplete -- "${COMP_WORDS[@]:0:COMP_CWORD+1}" 2>/dev/null))
+}
+complete -F _task_terminal {commands}
+""",
+    "zsh": """
+_task_terminal() {
+    local -a candidates
+    candidates=(${(f)"$(taskcomplete -- "${(@)words[1,CURRENT]}" 2>/dev/null)"})
+    compadd -a candidates
+}
+compdef _task_terminal {commands}
+""",
+    "fish": """
+function __task_terminal_complete
+    set -l current (commandline -ct)
+    taskcomplete -- (commandline -opc) "$current" 2>/dev/null
+end
+for command in {commands}
+    complete -c $command -f -a '(__task_terminal_complete)'
+end
+""",
+}
+
+
+def main():
+    if sys.argv[1:2] == ["--"]:
+        # a completion request: answered before argparse or anything else is imported
+        print("\n".join(complete(sys.argv[2:])))
+        return
+
+    import argparse
+
+    from .helpers.completion import rebuild
+    from .helpers.helpers import check_init, reformat
+    from .helpers.state import session
+    from .helpers.store import get_store
+
+    parser = argparse.ArgumentParser(description="Shell completion for projects, lists and positions.")
+    parser.add_argument(
+        "shell",
+        type=str,
+        nargs="?",
+        choices=list(scripts),
+        help="Shell for which to print the completion script.",
+    )
+    parser.add_argument(
+        "-rebuild",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, recount every list and rebuild the completion cache.",
+    )
+    d = vars(parser.parse_args())
+
+    if d["rebuild"]:
+        check_init()
+        n = rebuild(get_store(), session.projects + session.hidden)
+        print(reformat(f"Counted {n} lists for completion."))
+        return
+    if not d["shell"]:
+        raise ValueError(reformat(f"One of {list(scripts)} or '-rebuild' must be provided.", input_type="error"))
+    print(scripts[d["shell"]].replace("{commands}", " ".join(grammar)).strip())
+
+
+if __name__ == "__main__":
+    main()
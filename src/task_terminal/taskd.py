@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Run the resident TaskTerminal daemon. While it is running, every other command is served from its memory over a
+local Unix socket; without it, commands read and write files directly.
+
+$ taskd
+$ taskd -status
+$ taskd -stop
+"""
+
+# base imports
+import argparse
+import json
+import os
+import socket
+
+from .helpers.daemon import serve, socket_path
+from .helpers.helpers import check_init, reformat
+
+
+def main():
+    check_init()
+
+    # establish parser to pull in projects to view
+    parser = argparse.ArgumentParser(description="Run the resident TaskTerminal daemon.")
+    parser.add_argument(
+        "-status",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, report whether a daemon is running.",
+    )
+    parser.add_argument(
+        "-stop",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="If provided, stop the running daemon.",
+    )
+    d = vars(parser.parse_args())
+
+    running = is_running()
+    if d["status"]:
+        print(reformat(f"Daemon {'running on ' + socket_path if running else 'not running'}."))
+    elif d["stop"]:
+        if not running:
+            raise ValueError(reformat("No daemon running.", input_type="error"))
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall((json.dumps({"command": "stop"}) + "\n").encode())
+            sock.recv(1024)
+        print(reformat("Daemon stopped."))
+    else:
+        if running:
+            raise ValueError(reformat(f"Daemon already running on {socket_path}.", input_type="error"))
+        serve()
+
+
+def is_running() -> bool:
+    if not os.path.exists(socket_path):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    main()